@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the detect.py CLI.
+
+Runs `python -X importtime -c "import detect"` in a fresh interpreter, reports
+the slowest imports and fails if the cumulative time exceeds the budget or if
+modules that only training/embedding-on-miss paths need were imported eagerly.
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 300 --runs 10
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# numpy dominates what remains (~100ms); the rest of the CLI should add little on top
+IMPORT_BUDGET_MS = 250
+
+# Only needed for training, API calls on cache misses, async or bulk modes
+DEFERRED_MODULES = ["sklearn", "openai", "dotenv", "asyncio", "sqlite3", "concurrent.futures"]
+
+
+def measure(module: str) -> tuple[float, dict[str, float]]:
+    """
+    Import module in a fresh interpreter.
+
+    Returns:
+        (total ms, {imported module: cumulative ms})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum) / 1000
+    return cumulative[module], cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check detect.py import time against a budget")
+    parser.add_argument("--module", default="detect")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    best_total, modules = min(runs, key=lambda r: r[0])
+
+    print(f"import {args.module}: {best_total:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print("\nSlowest top-level imports:")
+    top = sorted(((ms, name) for name, ms in modules.items() if "." not in name), reverse=True)[:8]
+    for ms, name in top:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    eager = [m for m in DEFERRED_MODULES if m in modules]
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if best_total > args.budget_ms:
+        print(f"\nFAIL: {best_total:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("\nOK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark NumPy MLP inference against sklearn.
+
+Compares the folded-scaler float32 forward pass (src/inference.py) with
+sklearn's scaler.transform + predict + predict_proba, and checks that the
+probabilities agree.
+
+Usage:
+    python benchmarks/inference.py                   # Synthetic model, no API needed
+    python benchmarks/inference.py --model models/pii_model.pkl
+"""
+import sys
+import time
+import argparse
+import pickle
+import numpy as np
+
+sys.path.insert(0, ".")
+from src.inference import MLPInference
+
+
+def synthetic_model(dim: int = 1536, n: int = 2000):
+    """Fit a small MLP with the production architecture on random data."""
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(42)
+    X = rng.standard_normal((n, dim)).astype(np.float32)
+    y = (X[:, :10].sum(axis=1) > 0).astype(int)
+    scaler = StandardScaler().fit(X)
+    model = MLPClassifier(hidden_layer_sizes=(256, 128, 64), max_iter=20, random_state=42)
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NumPy vs sklearn MLP inference")
+    parser.add_argument("--model", help="Pickled PII model (default: synthetic)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 4096])
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.model:
+        with open(args.model, "rb") as f:
+            data = pickle.load(f)
+        model, scaler = data["model"], data["scaler"]
+    else:
+        model, scaler = synthetic_model()
+    engine = MLPInference.from_sklearn(model, scaler)
+
+    def sklearn_detect(X):
+        X_scaled = scaler.transform(X)
+        model.predict(X_scaled)
+        return model.predict_proba(X_scaled)[:, 1]
+
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>6} | {'sklearn ms':>10} | {'numpy ms':>9} | {'speedup':>7} | {'max |dp|':>9}")
+    print("-" * 55)
+    for batch_size in args.batch_sizes:
+        X = rng.standard_normal((batch_size, engine.n_features)).astype(np.float32)
+        diff = np.max(np.abs(sklearn_detect(X) - engine.prob_pii(X)))
+        repeats = max(3, args.repeats if batch_size < 1024 else args.repeats // 10)
+        t_sklearn = time_call(lambda: sklearn_detect(X), repeats)
+        t_numpy = time_call(lambda: engine.prob_pii(X), repeats)
+        print(f"{batch_size:>6} | {t_sklearn:>10.3f} | {t_numpy:>9.3f} | {t_sklearn / t_numpy:>6.1f}x | {diff:>9.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the embedding, inference and similarity hot paths.
+
+Runs everything against a deterministic fake embedding backend (no API, no
+network) and synthetic models of production shape, so results only move when
+the code does. Measures latency percentiles and throughput for get_embeddings,
+PIIDetector.detect, ResumeSimilarity.compare and find_similar, plus model load
+time and peak RSS, and writes them as JSON.
+
+Comparing against a stored baseline exits non-zero on regressions, so the suite
+can gate upgrades:
+
+Usage:
+    python benchmarks/suite.py                                   # print results
+    python benchmarks/suite.py --output benchmarks/baseline.json # record a baseline
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --threshold 0.15
+    python benchmarks/suite.py --quick                           # fewer sizes and repeats
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import io
+import platform
+import resource
+import subprocess
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Measure the code paths, not the on-disk cache
+os.environ.setdefault("EMBEDDING_CACHE", "0")
+
+from src import embeddings
+from src.embeddings import EmbeddingBackend, DEFAULT_MODEL, get_embeddings
+from src.inference import MLPInference
+from src.pii_detector import PIIDetector
+from src.resume_similarity import ResumeSimilarity
+
+DIM = 1536
+HIDDEN_LAYERS = (256, 128, 64)
+IMPORTANT_DIMS = 200
+
+# Metrics compared against the baseline (lower is better); only gated ones can fail
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+GATED_METRICS = ("p50_ms",)
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_DELTA_MS = 0.05
+
+WORDS = (
+    "engineer manager data python sales contact email phone address experience team "
+    "project customer report meeting budget design cloud security research market "
+    "account the a of and to in for with on at by from"
+).split()
+
+
+class FakeBackend(EmbeddingBackend):
+    """
+    Deterministic unit vectors seeded from a hash of each text.
+
+    latency_ms adds a fixed sleep per embed() call to model a remote API.
+    """
+
+    name = "fake"
+
+    def __init__(self, dim: int = DIM, latency_ms: float = 0.0):
+        self.dim = dim
+        self.latency = latency_ms / 1000
+
+    def key(self, model: str = DEFAULT_MODEL) -> str:
+        return f"fake:{self.dim}"
+
+    def dimension(self, model: str = DEFAULT_MODEL) -> int:
+        return self.dim
+
+    def embed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        if self.latency:
+            time.sleep(self.latency)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+            out[i] = rng.standard_normal(self.dim, dtype=np.float32)
+        out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
+
+
+def make_texts(n: int, seed: int = 0, words: int = 40) -> list[str]:
+    """n distinct pseudo-sentences."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(WORDS), size=(n, words))
+    return [f"{i} " + " ".join(WORDS[j] for j in row) for i, row in enumerate(picks)]
+
+
+def synthetic_detector(backend_key: str) -> PIIDetector:
+    """PIIDetector with random weights of the production architecture (no sklearn)."""
+    rng = np.random.default_rng(42)
+    sizes = (DIM,) + HIDDEN_LAYERS + (1,)
+    weights = [rng.standard_normal((a, b)) / np.sqrt(a) for a, b in zip(sizes[:-1], sizes[1:])]
+    biases = [np.zeros(b) for b in sizes[1:]]
+    detector = PIIDetector()
+    detector.engine = MLPInference(weights, biases)
+    detector.backend = backend_key
+    return detector
+
+
+def synthetic_similarity(backend_key: str) -> ResumeSimilarity:
+    rng = np.random.default_rng(42)
+    similarity = ResumeSimilarity()
+    similarity.important_dims = sorted(rng.choice(DIM, IMPORTANT_DIMS, replace=False).tolist())
+    similarity.backend = backend_key
+    return similarity
+
+
+def measure(fn, repeats: int, items: int = 1, warmup: int = 2) -> dict:
+    """
+    Latency percentiles (ms) over repeats calls of fn, and items/sec throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    ms = times * 1000
+    return {
+        "calls": repeats,
+        "items_per_call": items,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        "throughput_per_sec": float(items * repeats / times.sum()),
+    }
+
+
+def repeats_for(items: int, repeats: int) -> int:
+    """Fewer repeats for large batches, so each case takes similar time."""
+    return max(5, min(repeats, repeats * 64 // max(items, 1)))
+
+
+def bench_embeddings(batch_sizes: list[int], repeats: int) -> dict:
+    results = {}
+    for n in batch_sizes:
+        texts = make_texts(n, seed=n)
+        results[f"get_embeddings/batch={n}"] = measure(
+            lambda: get_embeddings(texts), repeats_for(n, repeats), items=n
+        )
+    return results
+
+
+def bench_detect(detector: PIIDetector, batch_sizes: list[int], repeats: int) -> dict:
+    results = {}
+    for n in batch_sizes:
+        texts = make_texts(n, seed=1000 + n)
+        results[f"detect/batch={n}"] = measure(
+            lambda: detector.detect(texts), repeats_for(n, repeats), items=n
+        )
+    return results
+
+
+def bench_similarity(similarity: ResumeSimilarity, pool_sizes: list[int], repeats: int) -> dict:
+    a, b = make_texts(2, seed=7, words=200)
+    results = {"compare": measure(lambda: similarity.compare(a, b), repeats)}
+    for n in pool_sizes:
+        pool = make_texts(n, seed=2000 + n, words=200)
+        results[f"find_similar/pool={n}"] = measure(
+            lambda: similarity.find_similar(a, pool, top_k=5), repeats_for(n, repeats), items=n
+        )
+    return results
+
+
+def bench_load(detector: PIIDetector, similarity: ResumeSimilarity, repeats: int) -> dict:
+    """Compact model load time (the path used by the CLI, workers and server)."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pii_path = Path(tmp) / "pii_model.bin"
+        resume_path = Path(tmp) / "resume_model.bin"
+        with contextlib.redirect_stdout(io.StringIO()):
+            detector.save_compact(pii_path)
+            similarity.save_compact(resume_path)
+        results["load/pii_compact"] = measure(lambda: PIIDetector(pii_path).load(pii_path), repeats)
+        results["load/resume_compact"] = measure(
+            lambda: ResumeSimilarity(resume_path).load(resume_path), repeats
+        )
+    return results
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float,
+                        gated: tuple = GATED_METRICS) -> list[dict]:
+    """
+    Per-case ratios against the baseline.
+
+    A gated metric regresses when it is more than threshold slower and the
+    slowdown exceeds MIN_DELTA_MS; tail percentiles are reported but only fail
+    the run if gated.
+
+    Returns:
+        Rows with case, metric, baseline, current, ratio and regressed flag
+    """
+    rows = []
+    for case, current in results["cases"].items():
+        base = baseline.get("cases", {}).get(case)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            ratio = current[metric] / base[metric] if base[metric] else float("inf")
+            rows.append({
+                "case": case,
+                "metric": metric,
+                "baseline": base[metric],
+                "current": current[metric],
+                "ratio": ratio,
+                "regressed": (metric in gated and ratio > 1 + threshold
+                              and current[metric] - base[metric] > MIN_DELTA_MS),
+            })
+    base_rss = baseline.get("peak_rss_mb")
+    if base_rss:
+        ratio = results["peak_rss_mb"] / base_rss
+        rows.append({
+            "case": "process", "metric": "peak_rss_mb", "baseline": base_rss,
+            "current": results["peak_rss_mb"], "ratio": ratio, "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def print_results(results: dict):
+    print(f"{'case':<28} | {'p50 ms':>9} | {'p95 ms':>9} | {'p99 ms':>9} | {'items/s':>11}")
+    print("-" * 78)
+    for case, r in results["cases"].items():
+        print(f"{case:<28} | {r['p50_ms']:>9.3f} | {r['p95_ms']:>9.3f} | {r['p99_ms']:>9.3f} | "
+              f"{r['throughput_per_sec']:>11.1f}")
+    print(f"\nPeak RSS: {results['peak_rss_mb']:.1f} MB")
+
+
+def print_comparison(rows: list[dict], threshold: float):
+    print(f"\nAgainst baseline (regression if > {threshold:.0%} slower):")
+    print(f"{'case':<28} | {'metric':<11} | {'baseline':>9} | {'current':>9} | {'ratio':>6}")
+    print("-" * 76)
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(f"{row['case']:<28} | {row['metric']:<11} | {row['baseline']:>9.3f} | "
+              f"{row['current']:>9.3f} | {row['ratio']:>5.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding, inference and similarity hot paths")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 512])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0,
+                        help="Simulated per-call latency of the fake embedding backend")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer repeats")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown vs the baseline before failing (default: 0.10)")
+    parser.add_argument("--gate", nargs="+", default=list(GATED_METRICS), choices=COMPARED_METRICS,
+                        help="Metrics that fail the run on regression (default: p50_ms)")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.batch_sizes, args.pool_sizes, args.repeats = [1, 64], [10, 100], 20
+
+    backend = FakeBackend(latency_ms=args.embed_latency_ms)
+    embeddings.set_backend(backend)
+    detector = synthetic_detector(backend.key())
+    similarity = synthetic_similarity(backend.key())
+
+    cases = {}
+    cases.update(bench_embeddings(args.batch_sizes, args.repeats))
+    cases.update(bench_detect(detector, args.batch_sizes, args.repeats))
+    cases.update(bench_similarity(similarity, args.pool_sizes, args.repeats))
+    cases.update(bench_load(detector, similarity, args.repeats))
+
+    results = {
+        "environment": environment(),
+        "config": {
+            "batch_sizes": args.batch_sizes,
+            "pool_sizes": args.pool_sizes,
+            "repeats": args.repeats,
+            "embed_latency_ms": args.embed_latency_ms,
+        },
+        "cases": cases,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print_results(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        rows = compare_to_baseline(results, baseline, args.threshold, tuple(args.gate))
+        print_comparison(rows, args.threshold)
+        regressions = [row for row in rows if row["regressed"]]
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} regression(s)")
+            sys.exit(1)
+        print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Convert pickled models to the compact, pickle-free format.
+
+Writes a .bin file next to each .pkl. The compact files load with NumPy only,
+without importing sklearn.
+
+Usage:
+    python convert_models.py                      # Both default models
+    python convert_models.py models/pii_model.pkl
+"""
+import sys
+import argparse
+import pickle
+from pathlib import Path
+
+sys.path.insert(0, ".")
+from src.pii_detector import PIIDetector, MODEL_PATH as PII_MODEL_PATH
+from src.resume_similarity import ResumeSimilarity, MODEL_PATH as RESUME_MODEL_PATH
+
+
+def convert(path: Path):
+    """Convert one pickled model, detecting its type from the pickle contents."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if "important_dims" in data:
+        model = ResumeSimilarity(path).load(path)
+    else:
+        model = PIIDetector(path).load(path)
+    model.save_compact(path.with_suffix(".bin"), source=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert .pkl models to the compact format")
+    parser.add_argument("paths", nargs="*", type=Path, help="Pickled models to convert")
+    args = parser.parse_args()
+
+    paths = args.paths or [p for p in (PII_MODEL_PATH, RESUME_MODEL_PATH) if p.exists()]
+    if not paths:
+        print("No models found to convert.")
+        return
+    for path in paths:
+        convert(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ def demo_pii():
     print("=" * 60)
 
     detector = PIIDetector().load()
-    print(f"Model loaded: {detector.model.hidden_layer_sizes}\n")
+    print(f"Model loaded: {detector.engine.hidden_layer_sizes}\n")
 
     test_texts = [
         # Clean
@@ -6,12 +6,19 @@ Usage:
     python detect.py "Your text to analyze here"
     python detect.py -i                           # Interactive mode
     python detect.py -f file.txt                  # From file
+    python detect.py --spans -f file.txt          # Locate PII spans
+    python detect.py --stream -f dump.log         # Per-segment JSONL results
+    cat export.txt | python detect.py --stream    # Stream from stdin
+    python detect.py -r docs/ --glob "*.txt" -o report.jsonl --checkpoint scan.ckpt
+    python detect.py --stream --dedup near -f dump.log   # Embed one segment per near-duplicate group
 """
 import sys
+import json
 import argparse
 
 sys.path.insert(0, ".")
 from src.pii_detector import PIIDetector
+from src.dedup import make_deduplicator, MODES as DEDUP_MODES
 
 
 def detect_text(detector: PIIDetector, text: str):
@@ -27,6 +34,19 @@ def detect_text(detector: PIIDetector, text: str):
     print(f"PII Probability: {result['prob_pii']*100:.1f}%")
 
 
+def spans_text(detector: PIIDetector, text: str, hierarchical: bool):
+    """Print the character spans that look like PII."""
+    spans = detector.locate([text], hierarchical=hierarchical)[0]
+
+    if not spans:
+        print("\n[✓] No PII spans found")
+        return
+
+    print(f"\n[!] {len(spans)} PII span(s)")
+    for span in spans:
+        print(f"  [{span['start']}:{span['end']}] {span['prob_pii']*100:5.1f}%  \"{span['text']}\"")
+
+
 def interactive_mode(detector: PIIDetector):
     """Run in interactive mode."""
     print("=" * 50)
@@ -49,24 +69,102 @@ def interactive_mode(detector: PIIDetector):
     print("\nGoodbye!")
 
 
+def stream_mode(detector: PIIDetector, path: str, batch_size: int, max_bytes: int):
+    """Scan a file (or stdin for '-') incrementally, printing one JSON result per segment."""
+    from src.streaming import scan_stream, MAX_SEGMENT_BYTES
+
+    max_bytes = max_bytes or MAX_SEGMENT_BYTES
+    if detector.dedup is not None:
+        detector.dedup.on_batch = lambda texts, unique: print(
+            f"Dedup batch: {texts} segments, {unique} embedded ({1 - unique / texts:.1%} deduplicated)",
+            file=sys.stderr,
+        )
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        for result in scan_stream(detector, stream, batch_size=batch_size, max_bytes=max_bytes):
+            print(json.dumps(result), flush=True)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    if detector.dedup is not None:
+        print(f"Dedup ratio: {detector.dedup.ratio():.1%} of {detector.dedup.texts} segments", file=sys.stderr)
+
+
+def bulk_mode(args):
+    """Scan directories/globs with a process pool and print throughput."""
+    from src.bulk_scan import bulk_scan
+    from src.streaming import MAX_SEGMENT_BYTES
+
+    stats = bulk_scan(
+        args.recursive,
+        output=args.output,
+        pattern=args.glob,
+        fmt=args.format,
+        workers=args.workers,
+        checkpoint=args.checkpoint,
+        batch_size=args.batch_size,
+        max_bytes=args.max_bytes or MAX_SEGMENT_BYTES,
+        dedup=args.dedup,
+    )
+    print(f"Scanned {stats['files']} files ({stats['skipped']} skipped from checkpoint)")
+    print(f"Segments: {stats['segments']} ({stats['pii_segments']} with PII), errors: {stats['errors']}")
+    if args.dedup:
+        ratios = stats["dedup_batch_ratios"]
+        print(f"Dedup ratio: {stats['dedup_ratio']:.1%} of segments served without embedding")
+        if ratios:
+            print(f"Dedup ratio per batch ({len(ratios)} batches): min {min(ratios):.1%}, "
+                  f"median {sorted(ratios)[len(ratios) // 2]:.1%}, max {max(ratios):.1%}")
+            if len(ratios) <= 100:
+                print("  " + " ".join(f"{r:.0%}" for r in ratios))
+    print(f"Elapsed: {stats['elapsed_sec']:.1f}s")
+    print(f"Throughput: {stats['files_per_sec']:.1f} files/sec, {stats['segments_per_sec']:.1f} segments/sec")
+    print(f"Report written to {args.output}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Detect PII in text")
     parser.add_argument("text", nargs="?", help="Text to analyze")
     parser.add_argument("-i", "--interactive", action="store_true", help="Interactive mode")
-    parser.add_argument("-f", "--file", help="Read text from file")
+    parser.add_argument("-f", "--file", help="Read text from file ('-' for stdin)")
+    parser.add_argument("--stream", action="store_true", help="Segment input and emit per-segment JSONL")
+    parser.add_argument("--batch-size", type=int, default=64, help="Segments per detection batch (stream mode)")
+    parser.add_argument("--max-bytes", type=int, help="Maximum segment size in bytes (default: 2000)")
+    parser.add_argument("-r", "--recursive", nargs="+", metavar="PATH",
+                        help="Scan directories (recursively) or glob patterns with a process pool")
+    parser.add_argument("--glob", default="*", help="Filename pattern for files in scanned directories")
+    parser.add_argument("-o", "--output", default="pii_report.jsonl", help="Bulk scan report (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Report format (default: from extension)")
+    parser.add_argument("--workers", type=int, help="Worker processes for bulk scan (default: CPU count)")
+    parser.add_argument("--checkpoint", help="Checkpoint file for resuming an interrupted bulk scan")
+    parser.add_argument("--dedup", choices=DEDUP_MODES,
+                        help="Collapse duplicate segments per batch before embedding (stream and bulk modes)")
+    parser.add_argument("--spans", action="store_true", help="Locate PII spans instead of scoring the whole text")
+    parser.add_argument("--flat", action="store_true", help="With --spans, score every fine window (no coarse pass)")
     args = parser.parse_args()
 
+    if args.recursive:
+        bulk_mode(args)
+        return
+
     # Load model
-    detector = PIIDetector().load()
+    detector = PIIDetector(dedup=make_deduplicator(args.dedup)).load()
 
-    if args.interactive:
+    if args.stream:
+        stream_mode(detector, args.file or "-", args.batch_size, args.max_bytes)
+    elif args.interactive:
         interactive_mode(detector)
-    elif args.file:
-        with open(args.file) as f:
-            text = f.read().strip()
-        detect_text(detector, text)
-    elif args.text:
-        detect_text(detector, args.text)
+    elif args.file or args.text:
+        if args.file == "-":
+            text = sys.stdin.read().strip()
+        elif args.file:
+            with open(args.file) as f:
+                text = f.read().strip()
+        else:
+            text = args.text
+        if args.spans:
+            spans_text(detector, text, hierarchical=not args.flat)
+        else:
+            detect_text(detector, text)
     else:
         parser.print_help()
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+PII Detection Server
+
+Keeps one PIIDetector loaded and micro-batches concurrent requests.
+
+Usage:
+    python serve.py                               # http://127.0.0.1:8080
+    python serve.py --port 9000 --max-batch-size 128 --max-wait-ms 10
+    python serve.py --unix /tmp/pii.sock
+
+    curl -s localhost:8080/detect -d '{"texts": ["Call John at 555-1234"]}'
+    curl -s localhost:8080/metrics
+    curl -s localhost:8080/metrics/prometheus     # with --stage-metrics for stage timers
+"""
+import os
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, ".")
+from src.pii_detector import PIIDetector, MODEL_PATH
+from src.server import MicroBatcher, make_server
+from src.dedup import make_deduplicator, MODES as DEDUP_MODES
+from src import instrumentation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve PII detection over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH, help="Model path")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Texts per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Max wait to fill a batch")
+    parser.add_argument("--backlog", type=int, help="Listen queue length (default: socket.SOMAXCONN)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES,
+                        help="Embed one text per group of (near-)duplicates in each micro-batch")
+    parser.add_argument("--stage-metrics", action="store_true",
+                        help="Record per-stage timers and counters (embed, forward, cache, API calls)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    if args.stage_metrics:
+        instrumentation.enable()
+
+    detector = PIIDetector(args.model, dedup=make_deduplicator(args.dedup)).load()
+    batcher = MicroBatcher(detector, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+
+    if args.unix and os.path.exists(args.unix):
+        os.unlink(args.unix)
+    server = make_server(batcher, args.host, args.port, unix_socket=args.unix, verbose=args.verbose,
+                         backlog=args.backlog)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving PII detection on {where} (batch {args.max_batch_size}, wait {args.max_wait_ms}ms)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+    print("\nServer stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Approximate nearest-neighbor search (pure NumPy IVF).
+
+Vectors are partitioned by spherical k-means into `nlist` inverted lists. A
+query scores the centroids, then scans only the `nprobe` closest lists, trading
+recall for latency. Assumes L2-normalized vectors and inner-product scoring, as
+produced by ResumeSimilarity.focus().
+"""
+import time
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src.embeddings import top_k_indices
+except ImportError:
+    from embeddings import top_k_indices
+
+
+ASSIGN_CHUNK = 65536
+
+
+class IVFIndex:
+    """Inverted-file index over rows of an external vector matrix."""
+
+    def __init__(self, nlist: int = 1024, nprobe: int = 8, n_iter: int = 10,
+                 max_train_samples: int = 100_000, seed: int = 42):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.max_train_samples = max_train_samples
+        self.seed = seed
+        self.centroids = None
+        self.labels = np.empty(0, dtype=np.int32)
+        self._order = None
+        self._offsets = None
+
+    def train(self, vectors: np.ndarray):
+        """Fit centroids with spherical k-means on (a sample of) the vectors."""
+        rng = np.random.default_rng(self.seed)
+        n = len(vectors)
+        if n == 0:
+            raise ValueError("Cannot train an IVF index on zero vectors.")
+        self.nlist = min(self.nlist, n)
+
+        sample = vectors
+        if n > self.max_train_samples:
+            sample = vectors[np.sort(rng.choice(n, self.max_train_samples, replace=False))]
+        sample = np.asarray(sample, dtype=np.float32)
+
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assign = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=self.nlist)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), empty.sum(), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        self.centroids = centroids.astype(np.float32)
+        return self
+
+    def build(self, vectors: np.ndarray):
+        """Train (if needed) and assign every row to a list."""
+        if self.centroids is None:
+            self.train(vectors)
+        self.labels = self._nearest(vectors, self.centroids)
+        self._order = None
+        return self
+
+    def add(self, vectors: np.ndarray):
+        """Assign appended rows to their nearest lists."""
+        self.labels = np.concatenate([self.labels, self._nearest(vectors, self.centroids)])
+        self._order = None
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray):
+        """Reassign rows whose vectors changed."""
+        self.labels[rows] = self._nearest(vectors, self.centroids)
+        self._order = None
+
+    def move(self, src: int, dst: int):
+        """Mirror a swap-with-last delete: the last row (src) moves to dst and is dropped."""
+        self.labels[dst] = self.labels[src]
+        self.labels = self.labels[:-1]
+        self._order = None
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, top_k: int = 5, nprobe: int = None):
+        """
+        Approximate top-k rows by inner product.
+
+        Returns:
+            (rows, scores) arrays sorted by score descending
+        """
+        self._ensure_lists()
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        probes = top_k_indices(self.centroids @ query, nprobe)
+        rows = np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in probes])
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+        scores = vectors[rows] @ query
+        top = top_k_indices(scores, top_k)
+        return rows[top], scores[top]
+
+    def _ensure_lists(self):
+        """Group rows by list (rebuilt lazily after mutations)."""
+        if self._order is None:
+            self._order = np.argsort(self.labels, kind="stable")
+            self._offsets = np.searchsorted(self.labels[self._order], np.arange(self.nlist + 1))
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Index of the highest inner-product centroid for each row."""
+        assign = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            block = np.asarray(vectors[start:start + ASSIGN_CHUNK], dtype=np.float32)
+            assign[start:start + ASSIGN_CHUNK] = np.argmax(block @ centroids.T, axis=1)
+        return assign
+
+
+def recall_report(ivf: IVFIndex, vectors: np.ndarray, queries: np.ndarray, top_k: int = 10,
+                  nprobes: tuple = (1, 2, 4, 8, 16, 32, 64)) -> list[dict]:
+    """
+    Measure recall@k against brute force and search latency for each nprobe.
+
+    Returns:
+        List of dicts with 'nprobe', 'recall', 'p50_ms', 'p99_ms', plus a final
+        'brute_force' row with exact-search latency
+    """
+    exact, brute_times = [], []
+    for q in queries:
+        start = time.perf_counter()
+        exact.append(set(top_k_indices(vectors @ q, top_k).tolist()))
+        brute_times.append(time.perf_counter() - start)
+
+    report = []
+    for nprobe in nprobes:
+        if nprobe > ivf.nlist:
+            break
+        hits, times = 0, []
+        for q, truth in zip(queries, exact):
+            start = time.perf_counter()
+            rows, _ = ivf.search(vectors, q, top_k, nprobe=nprobe)
+            times.append(time.perf_counter() - start)
+            hits += len(truth & set(rows.tolist()))
+        report.append({
+            "nprobe": nprobe,
+            "recall": hits / max(sum(len(t) for t in exact), 1),
+            "p50_ms": float(np.percentile(times, 50) * 1000),
+            "p99_ms": float(np.percentile(times, 99) * 1000),
+        })
+
+    report.append({
+        "nprobe": "brute_force",
+        "recall": 1.0,
+        "p50_ms": float(np.percentile(brute_times, 50) * 1000),
+        "p99_ms": float(np.percentile(brute_times, 99) * 1000),
+    })
+    return report
@@ -0,0 +1,208 @@
+"""
+Bulk PII scanning across many files.
+
+Files are sharded across a process pool; each worker loads the detector once and
+batches segments from all files in its shard. Results are written to a single
+JSONL or CSV report, and completed files are recorded in a checkpoint so an
+interrupted sweep can resume where it stopped.
+"""
+import csv
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fnmatch import fnmatch
+from pathlib import Path
+
+# Handle imports for both package and direct execution
+try:
+    from src.pii_detector import PIIDetector, MODEL_PATH
+    from src.streaming import iter_segments, batched, MAX_SEGMENT_BYTES
+    from src.dedup import make_deduplicator
+except ImportError:
+    from pii_detector import PIIDetector, MODEL_PATH
+    from streaming import iter_segments, batched, MAX_SEGMENT_BYTES
+    from dedup import make_deduplicator
+
+
+REPORT_FIELDS = ["file", "start", "end", "contains_pii", "confidence", "prob_pii", "error"]
+
+_worker = {}
+
+
+def iter_files(paths: list[str], pattern: str = "*"):
+    """
+    Expand directories (recursively) and glob patterns into file paths.
+
+    Files inside directories are filtered by pattern; explicit files are always kept.
+    """
+    for path in paths:
+        if glob.has_magic(path):
+            matches = sorted(glob.glob(path, recursive=True))
+        else:
+            matches = [path]
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, files in os.walk(match):
+                    dirs.sort()
+                    for name in sorted(files):
+                        if fnmatch(name, pattern):
+                            yield os.path.join(root, name)
+            elif os.path.isfile(match):
+                yield match
+
+
+def _init_worker(model_path: Path, batch_size: int, max_bytes: int, dedup: str):
+    """Load the detector once per worker process."""
+    _worker["detector"] = PIIDetector(model_path, dedup=make_deduplicator(dedup)).load()
+    _worker["batch_size"] = batch_size
+    _worker["max_bytes"] = max_bytes
+
+
+def _iter_shard_segments(paths: list[str], errors: list[dict]):
+    """Yield (file, start, end, text) for every segment in a shard."""
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                for start, end, text in iter_segments(f, max_bytes=_worker["max_bytes"]):
+                    yield path, start, end, text
+        except OSError as e:
+            errors.append({"file": path, "error": str(e)})
+
+
+def _scan_shard(paths: list[str]) -> tuple[list[str], list[dict], tuple]:
+    """
+    Scan a shard of files in one worker, batching segments across files.
+
+    Returns:
+        (paths, report rows, (unique segments embedded, dedup ratio of each batch))
+    """
+    detector = _worker["detector"]
+    dedup = detector.dedup
+    if dedup is not None:
+        dedup.reset()
+    rows, errors, batch_ratios = [], [], []
+    for batch in batched(_iter_shard_segments(paths, errors), _worker["batch_size"]):
+        results = detector.detect([text for *_, text in batch])
+        if dedup is not None:
+            batch_ratios.append(dedup.last_ratio)
+        for (path, start, end, _), result in zip(batch, results):
+            rows.append({
+                "file": path,
+                "start": start,
+                "end": end,
+                "contains_pii": result["contains_pii"],
+                "confidence": result["confidence"],
+                "prob_pii": result["prob_pii"],
+            })
+    embedded = dedup.unique if dedup is not None else len(rows)
+    return paths, rows + errors, (embedded, batch_ratios)
+
+
+def _load_checkpoint(path: Path) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    with open(path) as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+class _ReportWriter:
+    """JSONL or CSV report; a resumed scan appends, a fresh one starts the file over."""
+
+    def __init__(self, path: Path, fmt: str, resume: bool = False):
+        self.fmt = fmt
+        new = not resume or not path.exists() or path.stat().st_size == 0
+        self.file = open(path, "w" if new else "a", newline="")
+        if fmt == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=REPORT_FIELDS)
+            if new:
+                self.writer.writeheader()
+
+    def write(self, rows: list[dict]):
+        for row in rows:
+            if self.fmt == "csv":
+                self.writer.writerow(row)
+            else:
+                self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def bulk_scan(paths: list[str], output: Path, pattern: str = "*", fmt: str = None,
+              workers: int = None, checkpoint: Path = None, shard_size: int = 32,
+              batch_size: int = 64, max_bytes: int = MAX_SEGMENT_BYTES,
+              model_path: Path = MODEL_PATH, dedup: str = None) -> dict:
+    """
+    Scan many files for PII with a process pool.
+
+    Args:
+        paths: Files, directories (walked recursively) or glob patterns
+        output: Report path; format from fmt or the file extension (.csv, else JSONL)
+        pattern: Filename filter for files found in directories
+        workers: Worker processes (default: CPU count)
+        checkpoint: File listing completed paths; existing entries are skipped
+            and the report is appended to (without one, it is overwritten)
+        shard_size: Files per worker task
+        dedup: 'exact' or 'near' to embed one segment per group of duplicates
+            within each batch (see src/dedup.py)
+
+    Returns:
+        Dict with file/segment counts, overall and per-batch dedup ratios,
+        elapsed time and throughput
+    """
+    output = Path(output)
+    fmt = fmt or ("csv" if output.suffix.lower() == ".csv" else "jsonl")
+    checkpoint = Path(checkpoint) if checkpoint else None
+    done = _load_checkpoint(checkpoint)
+
+    stats = {"files": 0, "skipped": 0, "segments": 0, "pii_segments": 0, "errors": 0}
+    files = []
+    for p in iter_files(paths, pattern):
+        if p in done:
+            stats["skipped"] += 1
+        else:
+            files.append(p)
+    shards = [files[i:i + shard_size] for i in range(0, len(files), shard_size)]
+
+    embedded, batch_ratios = 0, []
+    start_time = time.perf_counter()
+    # Only a scan resuming from a non-empty checkpoint adds to the existing report
+    writer = _ReportWriter(output, fmt, resume=bool(done))
+    ckpt = open(checkpoint, "a") if checkpoint else None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(model_path, batch_size, max_bytes, dedup),
+        ) as pool:
+            futures = [pool.submit(_scan_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                shard, rows, (unique, ratios) = future.result()
+                embedded += unique
+                batch_ratios.extend(ratios)
+                writer.write(rows)
+                if ckpt:
+                    ckpt.write("".join(p + "\n" for p in shard))
+                    ckpt.flush()
+                stats["files"] += len(shard)
+                for row in rows:
+                    if "error" in row:
+                        stats["errors"] += 1
+                    else:
+                        stats["segments"] += 1
+                        stats["pii_segments"] += row["contains_pii"]
+    finally:
+        writer.close()
+        if ckpt:
+            ckpt.close()
+
+    elapsed = time.perf_counter() - start_time
+    stats["dedup_ratio"] = 1 - embedded / stats["segments"] if stats["segments"] else 0.0
+    stats["dedup_batch_ratios"] = batch_ratios
+    stats["elapsed_sec"] = elapsed
+    stats["files_per_sec"] = stats["files"] / elapsed if elapsed else 0.0
+    stats["segments_per_sec"] = stats["segments"] / elapsed if elapsed else 0.0
+    return stats
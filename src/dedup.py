@@ -0,0 +1,169 @@
+"""
+Text canonicalization and duplicate collapsing before embedding.
+
+Scan traffic repeats the same message with different whitespace, casing,
+ticket numbers or timestamps. Deduplicator maps each text in a batch to a
+group. Only the first member of each group (its original text) is embedded
+and scored, and the result is fanned back out to every member.
+
+Grouping works in two steps:
+
+    exact  texts with the same canonical form (see canonicalize())
+    near   optional; canonical forms whose 64-bit SimHash fingerprints are
+           within max_distance bits of a group representative
+
+Numbers that can themselves be PII must keep texts apart. Only short ids
+(at most 6 digits) are masked; the longer digit runs that carry account, card,
+passport or licence numbers are left as they are. Texts with a hit from the
+pre-filter's PII patterns (SSN, email, phone, card) are never masked and never
+joined to a near-duplicate group.
+"""
+import re
+import unicodedata
+from hashlib import blake2b
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src.prefilter import WORD, match_patterns
+    from src import instrumentation
+except ImportError:
+    from prefilter import WORD, match_patterns
+    import instrumentation
+
+# Volatile tokens replaced before comparison, applied in order (before casefolding).
+# Id masks stop at 6 digits so longer (possibly PII) numbers are never masked.
+MASKS = (
+    (re.compile(r"\b[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"), "<timestamp>"),
+    (re.compile(r"\b\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?\b"), "<time>"),
+    (re.compile(r"#\d{1,6}\b"), "#<id>"),
+    (re.compile(r"\b[A-Z]{2,}(?:-\d{1,6})+\b"), "<id>"),
+)
+WHITESPACE = re.compile(r"\s+")
+
+MODES = ("exact", "near")
+SHINGLE = 3
+MAX_DISTANCE = 3
+FINGERPRINT_BITS = 64
+_BIT = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def canonicalize(text: str, mask: bool = True) -> str:
+    """Unicode-normalize, mask volatile ids and timestamps, casefold and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text)
+    if mask:
+        for pattern, placeholder in MASKS:
+            text = pattern.sub(placeholder, text)
+    return WHITESPACE.sub(" ", text.casefold()).strip()
+
+
+def simhash(canonical: str) -> int:
+    """64-bit SimHash of word shingles of a canonical text."""
+    tokens = WORD.findall(canonical)
+    shingles = {" ".join(tokens[i:i + SHINGLE]) for i in range(max(len(tokens) - SHINGLE + 1, 1))}
+    hashes = np.fromiter(
+        (int.from_bytes(blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    bits = ((hashes[:, None] >> _BIT) & np.uint64(1)).astype(np.int32)
+    votes = 2 * bits.sum(axis=0) - len(hashes)
+    return int((np.uint64(1) << _BIT[votes > 0]).sum())
+
+
+class Deduplicator:
+    """
+    Groups the texts of a batch so each group is embedded once.
+
+    Args:
+        near: Also collapse near-duplicates by SimHash distance
+        max_distance: Maximum differing fingerprint bits for a near-duplicate
+        on_batch: Optional callback(texts, unique) after every grouped batch
+    """
+
+    def __init__(self, near: bool = False, max_distance: int = MAX_DISTANCE, on_batch=None):
+        self.near = near
+        self.max_distance = max_distance
+        self.on_batch = on_batch
+        self.texts = 0
+        self.unique = 0
+        self.last_ratio = 0.0
+
+    def group(self, texts: list[str]) -> tuple[list[int], np.ndarray]:
+        """
+        Group a batch.
+
+        Returns:
+            (representatives, assign): indices of the texts to embed, and for
+            every text the position of its representative in that list
+        """
+        assign = np.empty(len(texts), dtype=np.intp)
+        representatives = []
+        exact = {}
+        # Pigeonhole banding: fingerprints within max_distance bits agree on at least one band
+        bands = self.max_distance + 1
+        width = -(-FINGERPRINT_BITS // bands)
+        buckets = [{} for _ in range(bands)]
+        fingerprints = []
+
+        for i, text in enumerate(texts):
+            # Texts with PII-shaped numbers only collapse with exact (unmasked) copies
+            sensitive = bool(match_patterns(text))
+            key = (sensitive, canonicalize(text, mask=not sensitive))
+            group = exact.get(key)
+            near = self.near and not sensitive
+            if group is None and near:
+                fp = simhash(key[1])
+                group = self._near_group(fp, fingerprints, buckets, width)
+            if group is None:
+                group = len(representatives)
+                representatives.append(i)
+                fingerprints.append(fp if near else None)
+                if near:
+                    for band, bucket in enumerate(buckets):
+                        bucket.setdefault((fp >> (band * width)) & ((1 << width) - 1), []).append(group)
+            exact[key] = group
+            assign[i] = group
+
+        self._record(len(texts), len(representatives))
+        return representatives, assign
+
+    def _near_group(self, fp: int, fingerprints: list[int], buckets: list[dict], width: int):
+        """Representative group within max_distance bits of fp, if any."""
+        mask = (1 << width) - 1
+        for band, bucket in enumerate(buckets):
+            for group in bucket.get((fp >> (band * width)) & mask, ()):
+                if (fp ^ fingerprints[group]).bit_count() <= self.max_distance:
+                    return group
+        return None
+
+    def _record(self, n_texts: int, n_unique: int):
+        self.texts += n_texts
+        self.unique += n_unique
+        self.last_ratio = 1 - n_unique / n_texts if n_texts else 0.0
+        instrumentation.incr("dedup.texts", n_texts)
+        instrumentation.incr("dedup.unique", n_unique)
+        if self.on_batch is not None:
+            self.on_batch(n_texts, n_unique)
+
+    def ratio(self) -> float:
+        """Share of all texts seen so far that were served by another group member."""
+        return 1 - self.unique / self.texts if self.texts else 0.0
+
+    def reset(self):
+        self.texts = self.unique = 0
+        self.last_ratio = 0.0
+
+
+def fan_out(texts: list[str], results: list[dict], assign: np.ndarray) -> list[dict]:
+    """Copy each representative's result dict to every member, with the member's own text."""
+    return [{**results[group], "text": text} for text, group in zip(texts, assign)]
+
+
+def make_deduplicator(mode: str = None):
+    """Deduplicator for a CLI mode: None/'off', 'exact' or 'near'."""
+    if mode in (None, "off"):
+        return None
+    if mode not in MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Choose from: off, {', '.join(MODES)}")
+    return Deduplicator(near=mode == "near")
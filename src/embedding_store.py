@@ -0,0 +1,133 @@
+"""
+On-disk embedding store.
+
+A raw row-major float32/float16 matrix plus a JSON metadata sidecar. Stores are
+written incrementally with append() and read back with np.memmap, so corpora of
+millions of vectors never have to be loaded into RAM.
+"""
+import json
+import numpy as np
+from pathlib import Path
+
+# Handle imports for both package and direct execution
+try:
+    from src.embeddings import get_embeddings, backend_id, DEFAULT_MODEL
+except ImportError:
+    from embeddings import get_embeddings, backend_id, DEFAULT_MODEL
+
+
+CHUNK_ROWS = 65536
+
+
+class EmbeddingStore:
+    """Embedding matrix at `path` with metadata in `path.with_suffix('.json')`."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta_path = self.path.with_suffix(".json")
+        with open(self.meta_path) as f:
+            self.meta = json.load(f)
+        self.dim = self.meta["dim"]
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.count = self.meta["count"]
+        self._file = None
+        self._array = None
+
+    @classmethod
+    def create(cls, path: Path, dim: int, dtype: str = "float32", model: str = DEFAULT_MODEL) -> "EmbeddingStore":
+        """
+        Create an empty store, overwriting any existing one at path.
+
+        `model` records the embedding space (see embeddings.backend_id).
+        """
+        if np.dtype(dtype) not in (np.float32, np.float16):
+            raise ValueError("dtype must be float32 or float16.")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+        meta = {"dim": dim, "dtype": np.dtype(dtype).name, "count": 0, "model": model}
+        path.with_suffix(".json").write_text(json.dumps(meta, indent=2))
+        return cls(path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.count, self.dim)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read-only memory-mapped (count, dim) view of the store."""
+        if self._array is None or len(self._array) != self.count:
+            if self.count == 0:
+                self._array = np.empty((0, self.dim), dtype=self.dtype)
+            else:
+                # Appended rows may still sit in the write buffer
+                if self._file is not None:
+                    self._file.flush()
+                self._array = np.memmap(self.path, dtype=self.dtype, mode="r", shape=self.shape)
+        return self._array
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __getitem__(self, key):
+        return self.array[key]
+
+    def append(self, vectors) -> None:
+        """Append rows to the end of the store."""
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected rows of dimension {self.dim}, got shape {vectors.shape}.")
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(vectors.tobytes())
+        self.count += len(vectors)
+
+    def flush(self) -> None:
+        """Flush appended rows and persist the metadata sidecar."""
+        if self._file is not None:
+            self._file.flush()
+        self.meta["count"] = self.count
+        self.meta_path.write_text(json.dumps(self.meta, indent=2))
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_chunks(self, chunk_rows: int = CHUNK_ROWS):
+        """Yield (start, float32 block) pairs covering the store."""
+        for start in range(0, self.count, chunk_rows):
+            yield start, np.asarray(self.array[start:start + chunk_rows], dtype=np.float32)
+
+
+def write_embeddings(path: Path, texts, dim: int = 1536, dtype: str = "float32",
+                     model: str = DEFAULT_MODEL, batch_size: int = 2048) -> EmbeddingStore:
+    """Embed an iterable of texts batch by batch into a new store."""
+    store = EmbeddingStore.create(path, dim=dim, dtype=dtype, model=backend_id(model))
+    with store:
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) == batch_size:
+                store.append(get_embeddings(batch, model=model))
+                batch = []
+        if batch:
+            store.append(get_embeddings(batch, model=model))
+    return store
+
+
+def as_matrix(embeddings) -> np.ndarray:
+    """Return an array view of embeddings, keeping EmbeddingStore data memory-mapped."""
+    if isinstance(embeddings, EmbeddingStore):
+        return embeddings.array
+    return np.asarray(embeddings)
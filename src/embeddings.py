@@ -1,47 +1,697 @@
 """
-Embedding generation using OpenAI's text-embedding-3-small model.
+Embedding generation.
+
+Embeddings come from a pluggable backend selected with EMBEDDING_BACKEND:
+    openai   OpenAI's text-embedding-3-small model (default)
+    hashing  Local CPU hashed character n-grams; no network access needed
+
+openai, dotenv, asyncio and the cache backend are imported on first use, so
+importing this module (and the CLI on top of it) stays cheap.
 """
+import base64
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import random
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src import instrumentation
+except ImportError:
+    import instrumentation
+
+DEFAULT_MODEL = "text-embedding-3-small"
 
-load_dotenv()
+# Output dimensions of known OpenAI models, used to preallocate result arrays
+MODEL_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
 
+# Per-request limits of the embeddings endpoint (tokens are estimated, so keep headroom)
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = 250_000
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 0.5
+
+# Concurrency defaults; EMBEDDING_MAX_WORKERS / EMBEDDING_MAX_CONCURRENCY override them
+MAX_WORKERS = 8
+MAX_CONCURRENCY = 64
+
+_env_loaded = False
+_backend = None
 _client = None
+_async_client = None
+_async_limiter = None
+_cache = None
+_encoding = None
+
+
+def _load_env():
+    """Load .env once, on first use."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def _env_int(name: str, default: int) -> int:
+    _load_env()
+    return int(os.getenv(name, default))
+
+
+def _retryable_errors() -> tuple:
+    """Transient API errors worth retrying."""
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+    return (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
 
 
 def get_client():
     """Get or create OpenAI client singleton."""
     global _client
     if _client is None:
+        from openai import OpenAI
+        _load_env()
         _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     return _client
 
 
-def get_embedding(text: str, model: str = "text-embedding-3-small") -> list[float]:
-    """Get embedding vector for a single text string."""
+def get_async_client():
+    """Get or create AsyncOpenAI client singleton."""
+    global _async_client
+    if _async_client is None:
+        from openai import AsyncOpenAI
+        _load_env()
+        _async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _async_client
+
+
+def _get_async_limiter():
+    """Semaphore bounding in-flight async embedding requests on the running loop."""
+    import asyncio
+    global _async_limiter
+    loop = asyncio.get_running_loop()
+    if _async_limiter is None or _async_limiter[0] is not loop:
+        limit = _env_int("EMBEDDING_MAX_CONCURRENCY", MAX_CONCURRENCY)
+        _async_limiter = (loop, asyncio.Semaphore(limit))
+    return _async_limiter[1]
+
+
+def get_cache():
+    """
+    Get or create the embedding cache singleton.
+
+    Configured with EMBEDDING_CACHE_PATH and EMBEDDING_CACHE_MAX_ENTRIES.
+    Returns None when EMBEDDING_CACHE=0.
+    """
+    global _cache
+    _load_env()
+    if _cache is None and os.getenv("EMBEDDING_CACHE", "1") != "0":
+        try:
+            from src.embedding_cache import EmbeddingCache, CACHE_PATH, MAX_ENTRIES
+        except ImportError:
+            from embedding_cache import EmbeddingCache, CACHE_PATH, MAX_ENTRIES
+        _cache = EmbeddingCache(
+            path=Path(os.getenv("EMBEDDING_CACHE_PATH", CACHE_PATH)),
+            max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", MAX_ENTRIES)),
+        )
+    return _cache
+
+
+def _get_encoding():
+    """tiktoken's cl100k_base encoding if tiktoken is installed and usable, else None."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Not installed, or its vocabulary file cannot be fetched
+            _encoding = False
+    return _encoding or None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Token count used for request budgeting; never below the true count.
+
+    Exact with tiktoken. Without it, the UTF-8 byte length: every BPE token
+    covers at least one byte, so CJK and other multi-byte scripts are not
+    undercounted.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=())) + 1
+    return len(text.encode("utf-8")) + 1
+
+
+def chunk_texts(texts: list[str], max_inputs: int = MAX_BATCH_INPUTS,
+                max_tokens: int = MAX_BATCH_TOKENS) -> list[tuple[int, int]]:
+    """
+    Split texts into contiguous request chunks within the input-count and token budgets.
+
+    Returns:
+        List of (start, end) index ranges into texts
+    """
+    chunks = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        n = estimate_tokens(text)
+        if i > start and (i - start >= max_inputs or tokens + n > max_tokens):
+            chunks.append((start, i))
+            start, tokens = i, 0
+        tokens += n
+    if start < len(texts):
+        chunks.append((start, len(texts)))
+    return chunks
+
+
+def _decode_vector(embedding) -> np.ndarray:
+    """Decode one response embedding: a base64 little-endian float32 buffer or a float list."""
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype="<f4")
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def _decode_into(data, out: np.ndarray = None) -> np.ndarray:
+    """
+    Write response items into the rows of out, by item index.
+
+    out is allocated from the first vector's size when not given.
+    """
+    for item in data:
+        vector = _decode_vector(item.embedding)
+        if out is None:
+            out = np.empty((len(data), len(vector)), dtype=np.float32)
+        out[item.index] = vector
+    return out
+
+
+def _count_tokens(response, texts: list[str]):
+    """Record billed tokens, falling back to the estimate when usage is not reported."""
+    if instrumentation.is_enabled():
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", None) or sum(estimate_tokens(t) for t in texts)
+        instrumentation.incr("embeddings.tokens", tokens)
+
+
+def _embed_chunk(texts: list[str], model: str, out: np.ndarray = None) -> np.ndarray:
+    """
+    Embed one request chunk into out, retrying transient API errors with exponential backoff.
+
+    Vectors are requested base64-encoded and decoded straight into float32 rows,
+    skipping JSON float parsing and Python float lists.
+    """
     client = get_client()
-    response = client.embeddings.create(input=text, model=model)
-    return response.data[0].embedding
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            instrumentation.incr("embeddings.api_calls")
+            response = client.embeddings.create(input=texts, model=model, encoding_format="base64")
+            _count_tokens(response, texts)
+            return _decode_into(response.data, out)
+        except _retryable_errors():
+            if attempt == MAX_RETRIES:
+                raise
+            instrumentation.incr("embeddings.api_retries")
+            time.sleep(RETRY_BASE_DELAY * 2 ** attempt * (1 + random.random()))
+
+
+def _alloc(texts: list[str], model: str):
+    """Preallocated (n, dim) result for models of known dimension, else None."""
+    dim = MODEL_DIMS.get(model)
+    return np.empty((len(texts), dim), dtype=np.float32) if dim else None
+
+
+def _embed_uncached(texts: list[str], model: str) -> np.ndarray:
+    """Send texts to the embedding API in budgeted chunks, dispatched concurrently."""
+    chunks = chunk_texts(texts)
+    out = _alloc(texts, model)
+    if len(chunks) == 1:
+        return _embed_chunk(texts, model, out)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = min(_env_int("EMBEDDING_MAX_WORKERS", MAX_WORKERS), len(chunks))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_embed_chunk, texts[start:end], model, None if out is None else out[start:end])
+            for start, end in chunks
+        ]
+        blocks = [future.result() for future in futures]
+    return out if out is not None else np.concatenate(blocks)
+
+
+async def _aembed_chunk(texts: list[str], model: str, out: np.ndarray = None) -> np.ndarray:
+    """Async version of _embed_chunk, bounded by the shared concurrency limiter."""
+    import asyncio
+
+    client = get_async_client()
+    limiter = _get_async_limiter()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            instrumentation.incr("embeddings.api_calls")
+            async with limiter:
+                response = await client.embeddings.create(input=texts, model=model, encoding_format="base64")
+            _count_tokens(response, texts)
+            return _decode_into(response.data, out)
+        except _retryable_errors():
+            if attempt == MAX_RETRIES:
+                raise
+            instrumentation.incr("embeddings.api_retries")
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt * (1 + random.random()))
+
+
+async def _aembed_uncached(texts: list[str], model: str) -> np.ndarray:
+    """Send texts to the embedding API in budgeted chunks, awaited concurrently."""
+    import asyncio
+
+    out = _alloc(texts, model)
+    blocks = await asyncio.gather(*(
+        _aembed_chunk(texts[start:end], model, None if out is None else out[start:end])
+        for start, end in chunk_texts(texts)
+    ))
+    return out if out is not None else np.concatenate(blocks)
+
+
+class EmbeddingBackend:
+    """Embedding provider interface: embed(texts) -> (n, dim) float32 array."""
+
+    name = "base"
+
+    def key(self, model: str = DEFAULT_MODEL) -> str:
+        """Identity of the vector space produced; used as cache namespace and recorded with models."""
+        return f"{self.name}:{model}"
+
+    def embed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        raise NotImplementedError
+
+    def dimension(self, model: str = DEFAULT_MODEL) -> int:
+        """Width of the vectors produced; by default measured on one probe text per model."""
+        dims = self.__dict__.setdefault("_dims", {})
+        if model not in dims:
+            dims[model] = self.embed([" "], model).shape[1]
+        return dims[model]
+
+    async def aembed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        """Async embed; by default runs embed() in a worker thread."""
+        import asyncio
+        return await asyncio.to_thread(self.embed, texts, model)
+
+
+class OpenAIBackend(EmbeddingBackend):
+    """OpenAI embeddings API with chunking, concurrency and retries."""
+
+    name = "openai"
+
+    def key(self, model: str = DEFAULT_MODEL) -> str:
+        # Bare model name, so caches and models built before backends existed stay valid
+        return model
+
+    def dimension(self, model: str = DEFAULT_MODEL) -> int:
+        return MODEL_DIMS.get(model) or super().dimension(model)
+
+    def embed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        return _embed_uncached(texts, model)
+
+    async def aembed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        return await _aembed_uncached(texts, model)
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Local CPU embeddings from signed, hashed character n-grams.
+
+    Deterministic and dependency-free, for air-gapped use and high throughput.
+    Vectors use sublinear term weighting and are L2-normalized. The model
+    argument is ignored.
+    """
 
+    name = "hashing"
 
-def get_embeddings(texts: list[str], model: str = "text-embedding-3-small") -> list[list[float]]:
-    """Get embedding vectors for multiple texts in a single API call."""
+    # Multiplier for the polynomial rolling hash over UTF-8 bytes
+    _PRIME = np.uint64(1099511628211)
+
+    def __init__(self, dim: int = 1536, ngram_range: tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def key(self, model: str = DEFAULT_MODEL) -> str:
+        lo, hi = self.ngram_range
+        return f"hashing:{self.dim}:{lo}-{hi}"
+
+    def dimension(self, model: str = DEFAULT_MODEL) -> int:
+        return self.dim
+
+    def embed(self, texts: list[str], model: str = DEFAULT_MODEL) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            out[i] = self._embed_one(text)
+        return out
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        data = np.frombuffer(f" {text} ".encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        counts = np.zeros(self.dim, dtype=np.float64)
+        lo, hi = self.ngram_range
+        for n in range(lo, hi + 1):
+            m = len(data) - n + 1
+            if m <= 0:
+                break
+            h = np.full(m, zlib.crc32(bytes([n])), dtype=np.uint64)
+            for k in range(n):
+                h = h * self._PRIME + data[k:k + m]
+            # Finalizer mix so low bits depend on every byte
+            h ^= h >> np.uint64(33)
+            h *= np.uint64(0xFF51AFD7ED558CCD)
+            h ^= h >> np.uint64(33)
+            buckets = (h % np.uint64(self.dim)).astype(np.intp)
+            signs = np.where(h >> np.uint64(63), -1.0, 1.0)
+            counts += np.bincount(buckets, weights=signs, minlength=self.dim)
+        vec = np.sign(counts) * np.log1p(np.abs(counts))
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "hashing": HashingBackend,
+}
+
+
+def get_backend() -> EmbeddingBackend:
+    """Get or create the embedding backend singleton (EMBEDDING_BACKEND, default 'openai')."""
+    global _backend
+    if _backend is None:
+        _load_env()
+        name = os.getenv("EMBEDDING_BACKEND", "openai")
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown EMBEDDING_BACKEND '{name}'. Choose from: {', '.join(BACKENDS)}")
+        _backend = BACKENDS[name]()
+    return _backend
+
+
+def set_backend(backend: EmbeddingBackend = None):
+    """Replace the active backend (None resets to EMBEDDING_BACKEND on next use)."""
+    global _backend
+    _backend = backend
+
+
+def backend_id(model: str = DEFAULT_MODEL) -> str:
+    """Identity of the active backend's vector space, recorded with trained models."""
+    return get_backend().key(model)
+
+
+def check_backend(trained_with: str, model: str = DEFAULT_MODEL):
+    """Raise if a model was trained on a different embedding space than the active backend."""
+    current = backend_id(model)
+    if trained_with != current:
+        raise ValueError(
+            f"Model was trained with embedding backend '{trained_with}' but the active backend "
+            f"is '{current}'. Set EMBEDDING_BACKEND to match or retrain the model."
+        )
+
+
+def get_embedding(text: str, model: str = DEFAULT_MODEL) -> np.ndarray:
+    """Get the float32 embedding vector for a single text string."""
+    return get_embeddings([text], model=model)[0]
+
+
+def _merge_cached(texts: list[str], cached: list, unique: list[str], fresh: np.ndarray) -> np.ndarray:
+    """Assemble cache hits and freshly embedded vectors into one (n, dim) float32 array."""
+    dim = fresh.shape[1] if len(fresh) else len(next(v for v in cached if v is not None))
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    rows = dict(zip(unique, range(len(unique))))
+    for i, vector in enumerate(cached):
+        out[i] = fresh[rows[texts[i]]] if vector is None else vector
+    return out
+
+
+def _count_cache(texts: list[str], unique_misses: list[str]):
+    """Count texts served without a backend call (cache hits and in-batch duplicates) and misses."""
+    if instrumentation.is_enabled():
+        hits = len(texts) - len(unique_misses)
+        instrumentation.incr("embeddings.cache_hits", hits)
+        instrumentation.incr("embeddings.cache_misses", len(unique_misses))
+
+
+def get_embeddings(texts: list[str], model: str = DEFAULT_MODEL, use_cache: bool = True) -> np.ndarray:
+    """
+    Get embedding vectors for multiple texts as an (n, dim) float32 array.
+
+    Cached vectors are returned directly; only cache misses are sent to the
+    active backend. With the OpenAI backend, large inputs are split into chunks
+    within the provider's per-request limits and sent concurrently, with
+    results returned in input order.
+    """
+    backend = get_backend()
     if not texts:
-        return []
-    client = get_client()
-    response = client.embeddings.create(input=texts, model=model)
-    return [item.embedding for item in response.data]
+        return np.empty((0, backend.dimension(model)), dtype=np.float32)
+
+    instrumentation.incr("embeddings.texts", len(texts))
+    cache = get_cache() if use_cache else None
+    if cache is None:
+        with instrumentation.timer("embeddings.backend"):
+            return backend.embed(texts, model)
+
+    key = backend.key(model)
+    with instrumentation.timer("embeddings.lookup"):
+        cached = cache.get_many(texts, key)
+    unique = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+    _count_cache(texts, unique)
+    with instrumentation.timer("embeddings.backend"):
+        fresh = backend.embed(unique, model) if unique else np.empty((0, 0), dtype=np.float32)
+    if unique:
+        cache.put_many(unique, key, fresh)
+        if len(unique) == len(texts):
+            return fresh
+    return _merge_cached(texts, cached, unique, fresh)
+
+
+async def aget_embeddings(texts: list[str], model: str = DEFAULT_MODEL, use_cache: bool = True) -> np.ndarray:
+    """Async version of get_embeddings (AsyncOpenAI for the OpenAI backend)."""
+    import asyncio
+
+    backend = get_backend()
+    if not texts:
+        # dimension() may probe the backend for models of unknown width
+        return np.empty((0, await asyncio.to_thread(backend.dimension, model)), dtype=np.float32)
+
+    instrumentation.incr("embeddings.texts", len(texts))
+    cache = get_cache() if use_cache else None
+    if cache is None:
+        with instrumentation.timer("embeddings.backend"):
+            return await backend.aembed(texts, model)
+
+    key = backend.key(model)
+    with instrumentation.timer("embeddings.lookup"):
+        cached = await asyncio.to_thread(cache.get_many, texts, key)
+    unique = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+    _count_cache(texts, unique)
+    with instrumentation.timer("embeddings.backend"):
+        fresh = await backend.aembed(unique, model) if unique else np.empty((0, 0), dtype=np.float32)
+    if unique:
+        await asyncio.to_thread(cache.put_many, unique, key, fresh)
+        if len(unique) == len(texts):
+            return fresh
+    return _merge_cached(texts, cached, unique, fresh)
+
+
+async def aget_embedding(text: str, model: str = DEFAULT_MODEL) -> np.ndarray:
+    """Async version of get_embedding."""
+    return (await aget_embeddings([text], model=model))[0]
+
+
+def warm_cache(texts: list[str], model: str = DEFAULT_MODEL, batch_size: int = 1000) -> dict:
+    """
+    Pre-warm the embedding cache from a corpus.
+
+    Returns:
+        Cache stats after warming
+    """
+    cache = get_cache()
+    if cache is None:
+        raise ValueError("Embedding cache is disabled (EMBEDDING_CACHE=0).")
+    for start in range(0, len(texts), batch_size):
+        get_embeddings(texts[start:start + batch_size], model=model)
+    return cache.stats()
+
+
+def cosine_similarity(v1, v2):
+    """
+    Cosine similarity between two vectors, or row-wise between batches.
+
+    Inputs broadcast over leading axes, so a (d,) vector against an (n, d)
+    batch gives n similarities. Returns a float for two vectors, else an array.
+    """
+    v1 = np.asarray(v1, dtype=np.float32)
+    v2 = np.asarray(v2, dtype=np.float32)
+    dots = np.einsum("...d,...d->...", v1, v2)
+    sim = dots / (np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1))
+    return float(sim) if np.ndim(sim) == 0 else sim
+
+
+def euclidean_distance(v1, v2):
+    """Euclidean distance between two vectors, or row-wise between batches (broadcasting)."""
+    dist = np.linalg.norm(np.asarray(v1, dtype=np.float32) - np.asarray(v2, dtype=np.float32), axis=-1)
+    return float(dist) if np.ndim(dist) == 0 else dist
+
+
+def top_k_indices(scores, k: int) -> np.ndarray:
+    """Indices of the k highest scores, sorted descending (argpartition + partial sort)."""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# Scratch memory (bytes) a tiled pairwise computation may use per tile
+MATRIX_MEMORY_BUDGET = 256 * 2**20
+METRICS = ("cosine", "euclidean")
+
+
+def _as_rows(X, dims=None, normalize: bool = False) -> np.ndarray:
+    """(n, d) float32 view of X, optionally restricted to dims and L2-normalized."""
+    X = np.asarray(X, dtype=np.float32)
+    if X.ndim == 1:
+        X = X[None, :]
+    if dims is not None:
+        X = X[:, dims]
+    if normalize:
+        X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+    return X
+
+
+def _row_tile(n_cols: int, memory_budget: int) -> int:
+    """Rows per tile so a (rows, n_cols) float32 block fits in memory_budget."""
+    return max(1, memory_budget // (4 * max(n_cols, 1)))
+
+
+def _pairwise_block(A: np.ndarray, B: np.ndarray, metric: str, b_sq: np.ndarray = None) -> np.ndarray:
+    """Scores between prepared row blocks: dot products for cosine, distances for euclidean."""
+    S = A @ B.T
+    if metric == "cosine":
+        return S
+    # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b, clipped against rounding below zero
+    S *= -2
+    S += np.einsum("ij,ij->i", A, A)[:, None]
+    S += b_sq if b_sq is not None else np.einsum("ij,ij->i", B, B)
+    np.maximum(S, 0, out=S)
+    return np.sqrt(S, out=S)
+
+
+def _pairwise_matrix(A, B, metric: str, dims, memory_budget: int, out) -> np.ndarray:
+    A = _as_rows(A, dims)
+    B = A if B is None else _as_rows(B, dims)
+    normalize = metric == "cosine"
+    if normalize:
+        B = _as_rows(B, normalize=True)
+    b_sq = None if normalize else np.einsum("ij,ij->i", B, B)
+    if out is None:
+        out = np.empty((len(A), len(B)), dtype=np.float32)
+    step = _row_tile(len(B) + A.shape[1], memory_budget)
+    for start in range(0, len(A), step):
+        block = _as_rows(A[start:start + step], normalize=normalize)
+        out[start:start + step] = _pairwise_block(block, B, metric, b_sq)
+    return out
+
+
+def cosine_similarity_matrix(A, B=None, dims=None, memory_budget: int = MATRIX_MEMORY_BUDGET,
+                             out: np.ndarray = None) -> np.ndarray:
+    """
+    Cosine similarities between every row of A (n, d) and of B (m, d).
+
+    Args:
+        B: Second set of rows (default: A itself)
+        dims: Optional dimension subset (e.g. ResumeSimilarity.important_dims)
+        memory_budget: Scratch bytes per tile; A is processed in row tiles
+        out: Optional (n, m) float32 array (e.g. a np.memmap) to write into
+
+    Returns:
+        (n, m) float32 similarity matrix
+    """
+    return _pairwise_matrix(A, B, "cosine", dims, memory_budget, out)
+
+
+def euclidean_distance_matrix(A, B=None, dims=None, memory_budget: int = MATRIX_MEMORY_BUDGET,
+                              out: np.ndarray = None) -> np.ndarray:
+    """Euclidean distances between every row of A and of B; arguments as cosine_similarity_matrix."""
+    return _pairwise_matrix(A, B, "euclidean", dims, memory_budget, out)
+
+
+def top_k_similar(A, B=None, k: int = 10, metric: str = "cosine", dims=None,
+                  exclude_self: bool = None,
+                  memory_budget: int = MATRIX_MEMORY_BUDGET) -> tuple[np.ndarray, np.ndarray]:
+    """
+    k nearest rows of B for every row of A, without materializing the (n, m) matrix.
+
+    Both inputs are tiled so each score block fits in memory_budget, and a running
+    top-k per query row is merged block by block. Works on memmaps, so both sides
+    can be far larger than RAM allows for the full matrix.
+
+    Args:
+        B: Rows to search (default: A itself)
+        metric: "cosine" (highest similarity first) or "euclidean" (smallest distance first)
+        dims: Optional dimension subset applied to both sides
+        exclude_self: Skip the matching row index (default: True when B is None), for dedup
 
+    Returns:
+        (indices, scores), each (n, k) with k capped at the number of
+        candidates, best first
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Choose from: {', '.join(METRICS)}")
+    if exclude_self is None:
+        exclude_self = B is None
+    same = B is None
+    normalize = metric == "cosine"
+    A = _as_rows(A, dims)
+    B = A if same else _as_rows(B, dims)
+    n, m = len(A), len(B)
+    k = max(0, min(k, m - exclude_self))
 
-def cosine_similarity(v1: list[float], v2: list[float]) -> float:
-    """Calculate cosine similarity between two vectors."""
-    import numpy as np
-    v1, v2 = np.array(v1), np.array(v2)
-    return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+    # Ranking key is "higher is better": similarity, or negated distance
+    sign = 1.0 if normalize else -1.0
+    best_idx = np.full((n, k), -1, dtype=np.intp)
+    best_key = np.full((n, k), -np.inf, dtype=np.float32)
+    if k == 0 or n == 0:
+        return best_idx, best_key
 
+    tile = max(1, memory_budget // 4)
+    a_rows = min(n, max(1, int(tile ** 0.5)))
+    b_cols = min(m, max(k, tile // a_rows))
+    for b_start in range(0, m, b_cols):
+        B_blk = _as_rows(B[b_start:b_start + b_cols], normalize=normalize)
+        b_sq = None if normalize else np.einsum("ij,ij->i", B_blk, B_blk)
+        cols = np.arange(b_start, b_start + len(B_blk))
+        for a_start in range(0, n, a_rows):
+            a_end = min(a_start + a_rows, n)
+            A_blk = _as_rows(A[a_start:a_end], normalize=normalize)
+            keys = _pairwise_block(A_blk, B_blk, metric, b_sq)
+            if sign < 0:
+                np.negative(keys, out=keys)
+            if exclude_self:
+                rows = np.arange(a_start, a_end)
+                hit = (rows >= b_start) & (rows < b_start + len(B_blk))
+                keys[hit.nonzero()[0], rows[hit] - b_start] = -np.inf
+            cand_key = np.concatenate([best_key[a_start:a_end], keys], axis=1)
+            cand_idx = np.concatenate(
+                [best_idx[a_start:a_end], np.broadcast_to(cols, keys.shape)], axis=1
+            )
+            part = np.argpartition(-cand_key, k - 1, axis=1)[:, :k]
+            best_key[a_start:a_end] = np.take_along_axis(cand_key, part, axis=1)
+            best_idx[a_start:a_end] = np.take_along_axis(cand_idx, part, axis=1)
 
-def euclidean_distance(v1: list[float], v2: list[float]) -> float:
-    """Calculate Euclidean distance between two vectors."""
-    import numpy as np
-    return float(np.linalg.norm(np.array(v1) - np.array(v2)))
+    order = np.argsort(-best_key, axis=1, kind="stable")
+    best_key = np.take_along_axis(best_key, order, axis=1)
+    best_idx = np.take_along_axis(best_idx, order, axis=1)
+    best_idx[np.isneginf(best_key)] = -1
+    return best_idx, sign * best_key
@@ -0,0 +1,59 @@
+"""
+Pure-NumPy inference for the PII MLP.
+
+The StandardScaler is folded into the first layer's weights, so a prediction is a
+single float32 forward pass with no sklearn validation overhead:
+
+    (x - mean) / scale @ W1 + b1  ==  x @ (W1 / scale[:, None]) + (b1 - (mean / scale) @ W1)
+"""
+import numpy as np
+
+
+class MLPInference:
+    """Float32 forward pass for a binary ReLU MLP with a logistic output."""
+
+    def __init__(self, weights: list[np.ndarray], biases: list[np.ndarray]):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None) -> "MLPInference":
+        """Export a fitted binary MLPClassifier (and optional StandardScaler)."""
+        if model.activation != "relu" or model.out_activation_ != "logistic":
+            raise ValueError("Only binary MLPClassifier models with relu activation are supported.")
+        weights = [np.asarray(w, dtype=np.float64) for w in model.coefs_]
+        biases = [np.asarray(b, dtype=np.float64) for b in model.intercepts_]
+        if scaler is not None:
+            mean = scaler.mean_ if scaler.with_mean else np.zeros(weights[0].shape[0])
+            scale = scaler.scale_ if scaler.with_std else np.ones(weights[0].shape[0])
+            biases[0] = biases[0] - (mean / scale) @ weights[0]
+            weights[0] = weights[0] / scale[:, None]
+        return cls(weights, biases)
+
+    @property
+    def hidden_layer_sizes(self) -> tuple:
+        return tuple(len(b) for b in self.biases[:-1])
+
+    @property
+    def n_features(self) -> int:
+        return self.weights[0].shape[0]
+
+    def prob_pii(self, X) -> np.ndarray:
+        """Probability of the positive class for each row of raw (unscaled) embeddings."""
+        h = np.asarray(X, dtype=np.float32)
+        for W, b in zip(self.weights[:-1], self.biases[:-1]):
+            h = h @ W
+            h += b
+            np.maximum(h, 0, out=h)
+        logits = (h @ self.weights[-1] + self.biases[-1])[:, 0]
+        # Numerically stable sigmoid
+        e = np.exp(-np.abs(logits))
+        return np.where(logits >= 0, 1 / (1 + e), e / (1 + e)).astype(np.float32)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities with sklearn's (n, 2) layout."""
+        p = self.prob_pii(X)
+        return np.stack([1 - p, p], axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        return (self.prob_pii(X) > 0.5).astype(np.int64)
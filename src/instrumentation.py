@@ -0,0 +1,227 @@
+"""
+Pipeline instrumentation: stage timers, counters and exporters.
+
+Disabled by default. When disabled, timer() returns a shared no-op context
+manager and incr() returns immediately, so the hooks left in hot paths cost a
+function call each. Enable with enable() or PIPELINE_METRICS=1, in the
+environment or in .env (read on first use, after .env is loaded).
+
+Stages and counters recorded by the pipeline:
+    embeddings.lookup / embeddings.backend      cache lookup, backend embed of misses
+    pii.embed / pii.forward / pii.postprocess   PIIDetector.detect (the scaler is
+                                                folded into forward)
+    resume.embed / resume.focus / resume.score / resume.postprocess
+    embeddings.texts, cache_hits, cache_misses, api_calls, api_retries, tokens
+    pii.texts, resume.comparisons, resume.candidates
+    localize.windows.level<N>                   windows scored per localization level
+    pii.prefilter, prefilter.regex / linear / embedding   pre-filter stage and texts per stage
+    pii.dedup, dedup.texts / dedup.unique       duplicate grouping and texts left to embed
+
+Export with to_prometheus() (text exposition format), write_openmetrics(path),
+or add_hook(callback) to forward every observation elsewhere.
+"""
+import os
+import threading
+import time
+
+PREFIX = "mlp_embedding"
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# None until first use; then resolved from PIPELINE_METRICS unless enable()/disable() ran
+_enabled = None
+_lock = threading.Lock()
+_counters = {}
+_timers = {}
+_hooks = []
+
+
+class _NullTimer:
+    """Shared no-op timer returned while instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Histogram:
+    __slots__ = ("count", "sum", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+def _resolve() -> bool:
+    """Read PIPELINE_METRICS once, after loading .env the same way the embedding client does."""
+    global _enabled
+    try:
+        from src.embeddings import _load_env
+    except ImportError:
+        from embeddings import _load_env
+    _load_env()
+    _enabled = os.getenv("PIPELINE_METRICS", "0") == "1"
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _resolve() if _enabled is None else _enabled
+
+
+def reset():
+    """Clear all recorded values (hooks are kept)."""
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+
+def add_hook(callback):
+    """Call callback(kind, name, value) for every observation; kind is 'counter' or 'timer'."""
+    _hooks.append(callback)
+
+
+def remove_hook(callback):
+    _hooks.remove(callback)
+
+
+def timer(name: str):
+    """Context manager timing a stage; a no-op when disabled."""
+    return _Timer(name) if is_enabled() else _NULL_TIMER
+
+
+def observe(name: str, seconds: float):
+    """Record one stage duration."""
+    if not is_enabled():
+        return
+    with _lock:
+        hist = _timers.get(name)
+        if hist is None:
+            hist = _timers[name] = _Histogram()
+        hist.add(seconds)
+    for hook in _hooks:
+        hook("timer", name, seconds)
+
+
+def incr(name: str, value: int = 1):
+    """Increment a counter."""
+    if not is_enabled():
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    for hook in _hooks:
+        hook("counter", name, value)
+
+
+def snapshot() -> dict:
+    """
+    Current values.
+
+    Returns:
+        {"counters": {name: value}, "timers": {name: {count, total_sec, mean_ms, max_ms}}}
+    """
+    with _lock:
+        timers = {
+            name: {
+                "count": h.count,
+                "total_sec": h.sum,
+                "mean_ms": h.sum / h.count * 1000 if h.count else 0.0,
+                "max_ms": h.max * 1000,
+            }
+            for name, h in _timers.items()
+        }
+        return {"counters": dict(_counters), "timers": timers}
+
+
+def _metric_name(name: str) -> str:
+    return f"{PREFIX}_{name.replace('.', '_').replace('-', '_')}"
+
+
+def to_prometheus(openmetrics: bool = False) -> str:
+    """Counters and stage histograms in Prometheus text (or OpenMetrics) format."""
+    lines = []
+    with _lock:
+        for name, value in sorted(_counters.items()):
+            metric = _metric_name(name)
+            # OpenMetrics names the counter family without the _total sample suffix
+            family = metric if openmetrics else f"{metric}_total"
+            lines.append(f"# TYPE {family} counter")
+            lines.append(f"{metric}_total {value}")
+        for name, h in sorted(_timers.items()):
+            metric = _metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(BUCKETS, h.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+            lines.append(f"{metric}_sum {h.sum}")
+            lines.append(f"{metric}_count {h.count}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_openmetrics(path):
+    """Atomically write the current values as an OpenMetrics text file (e.g. for node_exporter)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(to_prometheus(openmetrics=True))
+    os.replace(tmp, path)
+
+
+def export_periodically(path, interval: float = 15.0) -> threading.Event:
+    """
+    Rewrite an OpenMetrics file every interval seconds in a daemon thread.
+
+    Returns:
+        Event that stops the exporter when set
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            write_openmetrics(path)
+        write_openmetrics(path)
+
+    threading.Thread(target=run, name="metrics-exporter", daemon=True).start()
+    return stop
@@ -0,0 +1,109 @@
+"""
+Span-level PII localization.
+
+A text is split into overlapping windows of whitespace tokens. All windows
+are embedded in one batch and scored with the detector's MLP. Windows at or
+above the threshold are merged into character spans.
+
+In hierarchical mode, a coarse pass with large windows runs first. Only the
+token ranges of coarse windows that crossed a (lower) coarse threshold are
+split into fine windows and scored again. Clean documents stop after a handful
+of coarse windows, so most of the fine windows never need embedding.
+"""
+import re
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src import instrumentation
+except ImportError:
+    import instrumentation
+
+TOKEN = re.compile(r"\S+")
+
+# (window, stride) in tokens, coarse to fine
+FINE_LEVEL = (16, 8)
+COARSE_LEVEL = (64, 32)
+HIERARCHICAL_LEVELS = (COARSE_LEVEL, FINE_LEVEL)
+FLAT_LEVELS = (FINE_LEVEL,)
+
+THRESHOLD = 0.5
+# Coarse windows dilute the signal of a short PII mention, so refine more eagerly
+COARSE_THRESHOLD = 0.3
+
+
+def token_offsets(text: str) -> list[tuple[int, int]]:
+    """(start, end) character offsets of whitespace-delimited tokens."""
+    return [m.span() for m in TOKEN.finditer(text)]
+
+
+def windows(lo: int, hi: int, size: int, stride: int) -> list[tuple[int, int]]:
+    """Overlapping [a, b) token windows covering [lo, hi); the last one ends at hi."""
+    if hi - lo <= size:
+        return [(lo, hi)] if hi > lo else []
+    starts = list(range(lo, hi - size + 1, stride))
+    if starts[-1] + size < hi:
+        starts.append(hi - size)
+    return [(s, s + size) for s in starts]
+
+
+def merge_ranges(ranges: list[tuple]) -> list[tuple]:
+    """
+    Merge overlapping or touching (a, b, score) ranges, keeping the max score.
+    """
+    merged = []
+    for a, b, score in sorted(ranges):
+        if merged and a <= merged[-1][1]:
+            last = merged[-1]
+            merged[-1] = (last[0], max(last[1], b), max(last[2], score))
+        else:
+            merged.append((a, b, score))
+    return merged
+
+
+def locate_spans(score, texts: list[str], levels=HIERARCHICAL_LEVELS,
+                 threshold: float = THRESHOLD, coarse_threshold: float = COARSE_THRESHOLD) -> list[list[dict]]:
+    """
+    Localize PII spans in texts.
+
+    Args:
+        score: Function mapping a list of texts to an array of PII probabilities
+            (one batched call per level)
+        levels: (window, stride) token sizes, coarse to fine; every level but the
+            last only selects regions for the next one
+        threshold: Probability a final-level window needs to be reported
+        coarse_threshold: Probability a coarser window needs to be refined
+
+    Returns:
+        Per text, a list of {'start', 'end', 'text', 'prob_pii'} character spans
+    """
+    tokens = [token_offsets(text) for text in texts]
+    regions = [[(0, len(toks), 1.0)] if toks else [] for toks in tokens]
+
+    for level, (size, stride) in enumerate(levels):
+        final = level == len(levels) - 1
+        jobs = [
+            (doc, a, b)
+            for doc, doc_regions in enumerate(regions)
+            for lo, hi, _ in doc_regions
+            for a, b in windows(lo, hi, size, stride)
+        ]
+        window_texts = [texts[doc][tokens[doc][a][0]:tokens[doc][b - 1][1]] for doc, a, b in jobs]
+        probs = np.asarray(score(window_texts)) if jobs else np.empty(0)
+        instrumentation.incr(f"localize.windows.level{level}", len(jobs))
+
+        cut = threshold if final else coarse_threshold
+        hits = [[] for _ in texts]
+        for (doc, a, b), p in zip(jobs, probs):
+            if p >= cut:
+                hits[doc].append((a, b, float(p)))
+        regions = [merge_ranges(doc_hits) for doc_hits in hits]
+
+    results = []
+    for text, toks, doc_regions in zip(texts, tokens, regions):
+        spans = []
+        for a, b, p in doc_regions:
+            start, end = toks[a][0], toks[b - 1][1]
+            spans.append({"start": start, "end": end, "text": text[start:end], "prob_pii": p})
+        results.append(spans)
+    return results
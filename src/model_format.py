@@ -0,0 +1,127 @@
+"""
+Compact, pickle-free model format.
+
+A file is a magic string, a little-endian uint64 header length, a JSON header and
+the raw arrays, each aligned to 64 bytes. Array offsets are relative to the start
+of the data section, which begins at the first aligned position after the header:
+
+    b"EMBMODEL" | header length | {"meta": {...}, "arrays": {name: {dtype, shape, offset}}} | data
+
+Loading needs only NumPy and can memory-map the arrays, so short-lived workers
+start without importing sklearn or unpickling estimators.
+
+A compact file converted from a pickle records the pickle's SHA-256 as
+meta["source_sha256"]; default_load_path() uses it to tell whether the compact
+copy still matches its pickle.
+"""
+import hashlib
+import json
+import struct
+import numpy as np
+from pathlib import Path
+
+MAGIC = b"EMBMODEL"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def save_arrays(path: Path, arrays: dict[str, np.ndarray], meta: dict = None) -> None:
+    """Write named arrays and a JSON-serializable meta dict to path."""
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+    layout, offset = {}, 0
+    for name, a in arrays.items():
+        layout[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset = _align(offset + a.nbytes)
+
+    header = {"version": FORMAT_VERSION, "meta": meta or {}, "arrays": layout}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, a in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(a.tobytes())
+
+
+def load_arrays(path: Path, mmap: bool = True) -> tuple[dict[str, np.ndarray], dict]:
+    """
+    Read a file written by save_arrays.
+
+    Returns:
+        (arrays, meta); arrays are read-only memory maps when mmap=True
+    """
+    with open(path, "rb") as f:
+        header, data_start = _read_header(f, path)
+
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            offset = data_start + entry["offset"]
+            count = int(np.prod(shape)) if shape else 1
+            if mmap and count:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            else:
+                f.seek(offset)
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return arrays, header["meta"]
+
+
+def _read_header(f, path) -> tuple[dict, int]:
+    """(header, data section start) of an open compact file."""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not a compact model file.")
+    (header_len,) = struct.unpack("<Q", f.read(8))
+    header = json.loads(f.read(header_len))
+    if header["version"] > FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version {header['version']}.")
+    return header, _align(len(MAGIC) + 8 + header_len)
+
+
+def read_meta(path: Path) -> dict:
+    """Meta dict of a compact file, without reading its arrays."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)[0]["meta"]
+
+
+def file_digest(path: Path) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_load_path(source: Path) -> Path:
+    """
+    The compact copy next to a pickled model if it was converted from that exact
+    pickle (or the pickle is gone), otherwise the pickle itself.
+    """
+    source = Path(source)
+    compact = source.with_suffix(".bin")
+    if not is_compact(compact):
+        return source
+    if not source.exists():
+        return compact
+    recorded = read_meta(compact).get("source_sha256")
+    return compact if recorded == file_digest(source) else source
+
+
+def is_compact(path: Path) -> bool:
+    """True if path holds a compact model file."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
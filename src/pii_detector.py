@@ -4,143 +4,523 @@ PII (Personal Identifiable Information) Detector
 Uses embedding-based classification to detect personal data in text.
 Detects: names, emails, phones, SSNs, addresses, DOBs, financial info, medical records, IDs.
 """
+import json
+import os
 import pickle
+import time
+import warnings
+from itertools import islice
 import numpy as np
 from pathlib import Path
-from sklearn.neural_network import MLPClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
 # Handle imports for both package and direct execution
 try:
-    from src.embeddings import get_embeddings
+    from src.embeddings import get_embeddings, aget_embeddings, backend_id, check_backend, DEFAULT_MODEL
+    from src.embedding_store import as_matrix, CHUNK_ROWS
+    from src.inference import MLPInference
+    from src.model_format import save_arrays, load_arrays, is_compact, default_load_path, file_digest
+    from src.streaming import batched
+    from src.prefilter import Prefilter, STAGES
+    from src.dedup import fan_out
+    from src.localize import locate_spans, HIERARCHICAL_LEVELS, FLAT_LEVELS, THRESHOLD, COARSE_THRESHOLD
+    from src import instrumentation
 except ImportError:
-    from embeddings import get_embeddings
+    from embeddings import get_embeddings, aget_embeddings, backend_id, check_backend, DEFAULT_MODEL
+    from embedding_store import as_matrix, CHUNK_ROWS
+    from inference import MLPInference
+    from model_format import save_arrays, load_arrays, is_compact, default_load_path, file_digest
+    from streaming import batched
+    from prefilter import Prefilter, STAGES
+    from dedup import fan_out
+    from localize import locate_spans, HIERARCHICAL_LEVELS, FLAT_LEVELS, THRESHOLD, COARSE_THRESHOLD
+    import instrumentation
 
 
 MODEL_PATH = Path(__file__).parent.parent / "models" / "pii_model.pkl"
+COMPACT_MODEL_PATH = MODEL_PATH.with_suffix(".bin")
+CV_FOLDS = 5
+STREAM_CHUNK = 1024
+
+
+def make_mlp():
+    """The PII classifier architecture and training settings."""
+    from sklearn.neural_network import MLPClassifier
+
+    return MLPClassifier(
+        hidden_layer_sizes=(256, 128, 64),
+        activation="relu",
+        solver="adam",
+        alpha=0.001,
+        batch_size=32,
+        learning_rate="adaptive",
+        learning_rate_init=0.001,
+        max_iter=500,
+        early_stopping=True,
+        validation_fraction=0.15,
+        n_iter_no_change=20,
+        random_state=42,
+        verbose=False,
+    )
+
+
+def _fit_pipeline(X, y, train_idx, test_idx) -> tuple:
+    """
+    Fit scaler + MLP on train_idx rows and score on test_idx rows.
+
+    Runs in a worker process; the scaler only sees its own training rows.
+
+    Returns:
+        (pipeline, test accuracy, fit seconds)
+    """
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    start = time.perf_counter()
+    pipeline = Pipeline([("scaler", StandardScaler()), ("mlp", make_mlp())])
+    pipeline.fit(X[np.sort(train_idx)], y[np.sort(train_idx)])
+    elapsed = time.perf_counter() - start
+    score = pipeline.score(X[test_idx], y[test_idx]) if len(test_idx) else float("nan")
+    return pipeline, score, elapsed
 
 
 class PIIDetector:
     """Detects personal identifiable information in text using embeddings."""
 
-    def __init__(self, model_path: Path = MODEL_PATH):
+    def __init__(self, model_path: Path = MODEL_PATH, dedup=None):
+        """
+        Args:
+            model_path: Model file used by save() and load()
+            dedup: Optional Deduplicator; detect() then embeds one text per
+                group of duplicates and fans the result out to the group
+        """
         self.model = None
         self.scaler = None
+        self.engine = None
+        self.backend = None
+        self.prefilter = None
+        self.dedup = dedup
         self.model_path = model_path
 
-    def train(self, texts: list[str], labels: list[int], test_size: float = 0.2) -> dict:
+    def train(self, texts: list[str], labels: list[int], test_size: float = 0.2, embeddings=None,
+              cv: int = CV_FOLDS, n_jobs: int = -1, prefilter: bool = False) -> dict:
         """
         Train the PII detection model.
 
+        The final model and the cross-validation folds are fitted in parallel
+        worker processes, each with its own scaler inside a Pipeline, so no
+        fold (and not the test split) leaks into scaling statistics.
+
         Args:
-            texts: List of text samples
+            texts: List of text samples (may be None when embeddings are given)
             labels: Binary labels (1=PII, 0=No PII)
             test_size: Fraction of data for testing
+            embeddings: Optional precomputed embeddings aligned with labels
+                (array, memmap or EmbeddingStore) instead of embedding texts
+            cv: Cross-validation folds; 0 skips CV (fast mode)
+            n_jobs: Worker processes for the parallel fits (-1 = all cores)
+            prefilter: Also train the regex + hashed linear pre-filter on the
+                training texts and report its cascade metrics (needs texts)
 
         Returns:
-            Dictionary with training metrics
+            Dictionary with training metrics, including per-phase wall times
         """
-        print(f"Generating embeddings for {len(texts)} texts...")
-        embeddings = get_embeddings(texts)
-        X = np.array(embeddings)
-        y = np.array(labels)
+        from joblib import Parallel, delayed
+        from sklearn.model_selection import StratifiedKFold, train_test_split
+        from sklearn.metrics import accuracy_score
 
-        # Scale features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        timings = {}
+        start_time = phase = time.perf_counter()
+        if embeddings is None:
+            print(f"Generating embeddings for {len(texts)} texts...")
+            self.backend = backend_id()
+            embeddings = get_embeddings(texts)
+        else:
+            self.backend = getattr(embeddings, "meta", {}).get("model", backend_id())
+        X = as_matrix(embeddings)
+        y = np.array(labels)
+        timings["embed_sec"] = time.perf_counter() - phase
 
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_scaled, y, test_size=test_size, random_state=42, stratify=y
+        # Split row indices so memory-mapped inputs stay on disk
+        train_idx, test_idx = train_test_split(
+            np.arange(len(y)), test_size=test_size, random_state=42, stratify=y
         )
 
-        print(f"Training set: {len(X_train)} samples")
-        print(f"Test set: {len(X_test)} samples")
-
-        # Train MLP
-        print("\nTraining neural network...")
-        self.model = MLPClassifier(
-            hidden_layer_sizes=(256, 128, 64),
-            activation="relu",
-            solver="adam",
-            alpha=0.001,
-            batch_size=32,
-            learning_rate="adaptive",
-            learning_rate_init=0.001,
-            max_iter=500,
-            early_stopping=True,
-            validation_fraction=0.15,
-            n_iter_no_change=20,
-            random_state=42,
-            verbose=False,
+        print(f"Training set: {len(train_idx)} samples")
+        print(f"Test set: {len(test_idx)} samples")
+
+        # Train the final MLP and the CV folds side by side
+        folds = list(StratifiedKFold(n_splits=cv).split(np.zeros(len(y)), y)) if cv else []
+        print(f"\nTraining neural network{f' with {cv}-fold cross-validation' if cv else ''}...")
+        phase = time.perf_counter()
+        results = Parallel(n_jobs=min(n_jobs, len(folds) + 1) if n_jobs > 0 else n_jobs)(
+            delayed(_fit_pipeline)(X, y, fit_idx, score_idx)
+            for fit_idx, score_idx in [(train_idx, np.empty(0, dtype=np.intp))] + folds
         )
-        self.model.fit(X_train, y_train)
+        timings["train_wall_sec"] = time.perf_counter() - phase
+        pipeline, _, timings["fit_sec"] = results[0]
+        cv_scores = np.array([score for _, score, _ in results[1:]])
+        timings["cv_sec"] = max((elapsed for _, _, elapsed in results[1:]), default=0.0)
 
-        # Evaluate
-        y_train_pred = self.model.predict(X_train)
-        y_test_pred = self.model.predict(X_test)
+        self.scaler = pipeline.named_steps["scaler"]
+        self.model = pipeline.named_steps["mlp"]
+        self.engine = MLPInference.from_sklearn(self.model, self.scaler)
+
+        # Evaluate with the folded NumPy engine
+        phase = time.perf_counter()
+        y_train_pred = self._predict_rows(X, train_idx)
+        y_test_pred = self._predict_rows(X, test_idx)
+        y_train, y_test = y[train_idx], y[test_idx]
 
         train_acc = accuracy_score(y_train, y_train_pred)
         test_acc = accuracy_score(y_test, y_test_pred)
+        timings["evaluate_sec"] = time.perf_counter() - phase
 
-        # Cross-validation
-        cv_scores = cross_val_score(self.model, X_scaled, y, cv=5)
+        cascade = None
+        if prefilter:
+            phase = time.perf_counter()
+            self.prefilter = Prefilter().fit([texts[i] for i in train_idx], y_train)
+            cascade = self._evaluate_cascade([texts[i] for i in test_idx], y_test, y_test_pred)
+            timings["prefilter_sec"] = time.perf_counter() - phase
+        timings["total_sec"] = time.perf_counter() - start_time
 
         metrics = {
             "train_accuracy": train_acc,
             "test_accuracy": test_acc,
-            "cv_mean": cv_scores.mean(),
-            "cv_std": cv_scores.std(),
+            "cv_mean": cv_scores.mean() if cv else None,
+            "cv_std": cv_scores.std() if cv else None,
             "iterations": self.model.n_iter_,
             "loss": self.model.loss_,
+            "cascade": cascade,
+            "timings": timings,
         }
 
         return metrics, y_test, y_test_pred
 
+    def _evaluate_cascade(self, texts: list[str], y, y_full) -> dict:
+        """
+        Stage traffic fractions and accuracy of the cascade vs the full
+        embedding path on held-out texts (y_full: full-path predictions).
+        """
+        routes = self.prefilter.route(texts)
+        self.prefilter.reset()
+        y_cascade = np.array([
+            full if stage == "embedding" else int(p > 0.5)
+            for (stage, p), full in zip(routes, y_full)
+        ])
+        stages = [stage for stage, _ in routes]
+        full_acc = float(np.mean(y_full == y))
+        cascade_acc = float(np.mean(y_cascade == y))
+        return {
+            "traffic": {stage: stages.count(stage) / len(stages) for stage in STAGES},
+            "band": (self.prefilter.low, self.prefilter.high),
+            "full_accuracy": full_acc,
+            "cascade_accuracy": cascade_acc,
+            "accuracy_delta": cascade_acc - full_acc,
+        }
+
+    def train_stream(self, samples, chunk_size: int = STREAM_CHUNK, epochs: int = 1,
+                     checkpoint: Path = None, checkpoint_every: int = 50) -> dict:
+        """
+        Train out of core from a stream of labeled texts.
+
+        Texts are embedded chunk by chunk (through the embedding cache), a running
+        StandardScaler is updated with each chunk, and the MLP is updated with
+        partial_fit. Only one chunk is in memory at a time.
+
+        Each chunk is scored before it is trained on, giving a progressive
+        (test-then-train) accuracy without a held-out set.
+
+        Args:
+            samples: Iterable of (text, label) pairs, or a JSONL path with
+                {"text": ..., "label": ...} per line
+            chunk_size: Samples embedded and trained on per step
+            epochs: Passes over the data (JSONL paths only)
+            checkpoint: Path for periodic checkpoints; if it exists, training
+                resumes from it and skips the samples already consumed
+            checkpoint_every: Chunks between checkpoints
+
+        Returns:
+            Dict with sample/chunk counts, progressive accuracy and throughput
+        """
+        from sklearn.preprocessing import StandardScaler
+
+        is_path = isinstance(samples, (str, Path))
+        if epochs > 1 and not is_path:
+            raise ValueError("Multiple epochs need a JSONL path; an iterable can only be read once.")
+
+        checkpoint = Path(checkpoint) if checkpoint else None
+        state = {"epoch": 0, "position": 0, "seen": 0, "correct": 0}
+        if checkpoint and checkpoint.exists():
+            with open(checkpoint, "rb") as f:
+                data = pickle.load(f)
+            self.model, self.scaler, self.backend = data["model"], data["scaler"], data["backend"]
+            state = data["state"]
+            check_backend(self.backend)
+            print(f"Resuming from {checkpoint} (epoch {state['epoch']}, sample {state['position']})")
+        else:
+            # Early stopping needs a held-out split, which partial_fit cannot keep
+            model = make_mlp().set_params(early_stopping=False)
+            self.model, self.scaler, self.backend = model, StandardScaler(), backend_id()
+
+        start_time = time.perf_counter()
+        trained, chunks = 0, 0
+        for epoch in range(state["epoch"], epochs):
+            stream = iter_labeled_jsonl(samples) if is_path else iter(samples)
+            for chunk in batched(islice(stream, state["position"], None), chunk_size):
+                texts = [text for text, _ in chunk]
+                y = np.array([label for _, label in chunk])
+                X = get_embeddings(texts)
+
+                if hasattr(self.model, "coefs_"):
+                    self.engine = MLPInference.from_sklearn(self.model, self.scaler)
+                    state["correct"] += int((self.engine.predict(X) == y).sum())
+                    state["seen"] += len(y)
+
+                self.scaler.partial_fit(X)
+                with warnings.catch_warnings():
+                    # A short final chunk is smaller than the MLP's minibatch size
+                    warnings.filterwarnings("ignore", message="Got `batch_size`")
+                    self.model.partial_fit(self.scaler.transform(X), y, classes=[0, 1])
+                state["position"] += len(chunk)
+                trained += len(chunk)
+                chunks += 1
+                if checkpoint and chunks % checkpoint_every == 0:
+                    self._save_checkpoint(checkpoint, state)
+            state["epoch"], state["position"] = epoch + 1, 0
+
+        if not hasattr(self.model, "coefs_"):
+            raise ValueError("No training samples in the stream.")
+        self.engine = MLPInference.from_sklearn(self.model, self.scaler)
+        if checkpoint:
+            self._save_checkpoint(checkpoint, state)
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            "samples": trained,
+            "chunks": chunks,
+            "epochs": state["epoch"],
+            "progressive_accuracy": state["correct"] / state["seen"] if state["seen"] else None,
+            "loss": self.model.loss_,
+            "elapsed_sec": elapsed,
+            "samples_per_sec": trained / elapsed if elapsed else 0.0,
+        }
+
+    def _save_checkpoint(self, path: Path, state: dict):
+        """Atomically write model, scaler and stream position."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"model": self.model, "scaler": self.scaler, "backend": self.backend,
+                         "state": state}, f)
+        os.replace(tmp, path)
+
+    def _predict_rows(self, X, rows: np.ndarray) -> np.ndarray:
+        """Predicted labels for the given rows of X, gathered in chunks."""
+        preds = np.empty(len(rows), dtype=np.int64)
+        for start in range(0, len(rows), CHUNK_ROWS):
+            preds[start:start + CHUNK_ROWS] = self.engine.predict(X[rows[start:start + CHUNK_ROWS]])
+        return preds
+
     def save(self, path: Path = None):
-        """Save model and scaler to disk."""
+        """Save model and scaler to disk, plus a compact copy next to it."""
         path = path or self.model_path
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "wb") as f:
-            pickle.dump({"model": self.model, "scaler": self.scaler}, f)
+            pickle.dump({"model": self.model, "scaler": self.scaler, "backend": self.backend,
+                         "prefilter": self.prefilter}, f)
         print(f"Model saved to {path}")
+        self.save_compact(path.with_suffix(".bin"), source=path)
+
+    def save_compact(self, path: Path = None, source: Path = None):
+        """
+        Save the folded inference weights in the pickle-free compact format.
+
+        source is the pickle this copy was made from; its hash is recorded.
+        """
+        path = path or self.model_path.with_suffix(".bin")
+        arrays = {}
+        for i, (W, b) in enumerate(zip(self.engine.weights, self.engine.biases)):
+            arrays[f"W{i}"] = W
+            arrays[f"b{i}"] = b
+        meta = {"type": "pii_mlp", "layers": len(self.engine.weights), "backend": self.backend}
+        if self.prefilter is not None:
+            prefilter_arrays, meta["prefilter"] = self.prefilter.to_compact()
+            arrays.update(prefilter_arrays)
+        if source is not None:
+            meta["source_sha256"] = file_digest(source)
+        save_arrays(path, arrays, meta=meta)
+        print(f"Compact model saved to {path}")
 
     def load(self, path: Path = None):
-        """Load model and scaler from disk."""
-        path = path or self.model_path
+        """
+        Load model from disk.
+
+        Compact (.bin) files load only the inference weights, without sklearn.
+        With no path, the compact copy is preferred when it was converted from
+        the current pickle (see model_format.default_load_path).
+        """
+        path = path or default_load_path(self.model_path)
+        if is_compact(path):
+            arrays, meta = load_arrays(path)
+            layers = meta["layers"]
+            self.engine = MLPInference(
+                [arrays[f"W{i}"] for i in range(layers)],
+                [arrays[f"b{i}"] for i in range(layers)],
+            )
+            self.model = None
+            self.scaler = None
+            self.backend = meta.get("backend") or DEFAULT_MODEL
+            self.prefilter = Prefilter.from_compact(arrays, meta["prefilter"]) if "prefilter" in meta else None
+            return self
+
         with open(path, "rb") as f:
             data = pickle.load(f)
         self.model = data["model"]
         self.scaler = data["scaler"]
+        # Models saved before backends were recorded were trained on OpenAI embeddings
+        self.backend = data.get("backend") or DEFAULT_MODEL
+        self.prefilter = data.get("prefilter")
+        self.engine = MLPInference.from_sklearn(self.model, self.scaler)
         return self
 
-    def detect(self, texts: list[str]) -> list[dict]:
+    def detect(self, texts: list[str], prefilter: bool = True) -> list[dict]:
         """
         Detect PII in texts.
 
+        With a trained pre-filter (and prefilter=True), texts it decides
+        confidently skip the embedding call; results then carry a 'stage' key.
+        With a deduplicator, duplicates share their representative's result.
+
         Returns:
             List of dicts with 'text', 'contains_pii', 'confidence', 'prob_pii'
         """
-        if self.model is None:
+        if self.engine is None:
+            raise ValueError("Model not loaded. Call load() or train() first.")
+
+        check_backend(self.backend)
+        unique, assign = self._dedupe(texts)
+        routes, pending = self._route(unique, prefilter)
+        classified = []
+        if pending:
+            with instrumentation.timer("pii.embed"):
+                embeddings = get_embeddings(pending)
+            classified = self._classify(pending, embeddings)
+        return self._fan_out(texts, self._merge_routes(unique, routes, classified), assign)
+
+    async def adetect(self, texts: list[str], prefilter: bool = True) -> list[dict]:
+        """Async version of detect() that does not block the event loop on embedding."""
+        if self.engine is None:
             raise ValueError("Model not loaded. Call load() or train() first.")
 
-        embeddings = get_embeddings(texts)
-        X = np.array(embeddings)
-        X_scaled = self.scaler.transform(X)
+        check_backend(self.backend)
+        unique, assign = self._dedupe(texts)
+        routes, pending = self._route(unique, prefilter)
+        classified = []
+        if pending:
+            with instrumentation.timer("pii.embed"):
+                embeddings = await aget_embeddings(pending)
+            classified = self._classify(pending, embeddings)
+        return self._fan_out(texts, self._merge_routes(unique, routes, classified), assign)
 
-        predictions = self.model.predict(X_scaled)
-        probabilities = self.model.predict_proba(X_scaled)
+    def _dedupe(self, texts: list[str]) -> tuple:
+        """Group representatives to score, and each text's group (None without a deduplicator)."""
+        if self.dedup is None:
+            return texts, None
+        with instrumentation.timer("pii.dedup"):
+            representatives, assign = self.dedup.group(texts)
+        return [texts[i] for i in representatives], assign
 
+    @staticmethod
+    def _fan_out(texts: list[str], results: list[dict], assign) -> list[dict]:
+        return results if assign is None else fan_out(texts, results, assign)
+
+    def _route(self, texts: list[str], prefilter: bool) -> tuple:
+        """Pre-filter routes (None without a pre-filter) and the texts that still need embedding."""
+        if not prefilter or self.prefilter is None:
+            return None, texts
+        with instrumentation.timer("pii.prefilter"):
+            routes = self.prefilter.route(texts)
+        return routes, [text for text, (stage, _) in zip(texts, routes) if stage == "embedding"]
+
+    @staticmethod
+    def _merge_routes(texts: list[str], routes, classified: list[dict]) -> list[dict]:
+        """Put pre-filter decisions and embedding-stage results back in input order."""
+        if routes is None:
+            return classified
+        remaining = iter(classified)
         results = []
-        for text, pred, probs in zip(texts, predictions, probabilities):
-            results.append({
-                "text": text,
-                "contains_pii": bool(pred),
-                "confidence": float(max(probs) * 100),
-                "prob_pii": float(probs[1]),
-            })
+        for text, (stage, p) in zip(texts, routes):
+            if stage == "embedding":
+                result = next(remaining)
+            else:
+                result = {
+                    "text": text,
+                    "contains_pii": p > 0.5,
+                    "confidence": max(p, 1 - p) * 100,
+                    "prob_pii": p,
+                }
+            result["stage"] = stage
+            results.append(result)
+        return results
+
+    def score_embeddings(self, embeddings, batch_size: int = CHUNK_ROWS) -> np.ndarray:
+        """
+        PII probability for each row of precomputed embeddings.
+
+        Accepts arrays, memmaps or an EmbeddingStore and scores them in batches.
+        """
+        if self.engine is None:
+            raise ValueError("Model not loaded. Call load() or train() first.")
+
+        X = as_matrix(embeddings)
+        scores = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), batch_size):
+            scores[start:start + batch_size] = self.engine.prob_pii(X[start:start + batch_size])
+        return scores
+
+    def score_texts(self, texts: list[str]) -> np.ndarray:
+        """PII probability for each text (one batched embedding call, one forward pass)."""
+        if self.engine is None:
+            raise ValueError("Model not loaded. Call load() or train() first.")
+
+        check_backend(self.backend)
+        with instrumentation.timer("pii.embed"):
+            embeddings = get_embeddings(texts)
+        with instrumentation.timer("pii.forward"):
+            return self.engine.prob_pii(embeddings)
+
+    def locate(self, texts: list[str], hierarchical: bool = True, threshold: float = THRESHOLD,
+               coarse_threshold: float = COARSE_THRESHOLD) -> list[list[dict]]:
+        """
+        Character spans of each text that look like PII.
+
+        Overlapping token windows are scored with the classifier and flagged
+        windows are merged. With hierarchical=True a coarse pass runs first and
+        only flagged coarse windows are split into fine ones.
+
+        Returns:
+            Per text, a list of dicts with 'start', 'end', 'text', 'prob_pii'
+        """
+        levels = HIERARCHICAL_LEVELS if hierarchical else FLAT_LEVELS
+        return locate_spans(self.score_texts, texts, levels=levels,
+                            threshold=threshold, coarse_threshold=coarse_threshold)
+
+    def _classify(self, texts: list[str], embeddings: np.ndarray) -> list[dict]:
+        """Run the classifier on precomputed embeddings (one forward pass)."""
+        instrumentation.incr("pii.texts", len(texts))
+        # Scaling is folded into the first layer, so it is timed as part of forward
+        with instrumentation.timer("pii.forward"):
+            prob_pii = self.engine.prob_pii(embeddings).tolist()
+
+        with instrumentation.timer("pii.postprocess"):
+            results = []
+            for text, p in zip(texts, prob_pii):
+                results.append({
+                    "text": text,
+                    "contains_pii": p > 0.5,
+                    "confidence": max(p, 1 - p) * 100,
+                    "prob_pii": p,
+                })
         return results
 
     def detect_single(self, text: str) -> dict:
@@ -148,8 +528,19 @@ class PIIDetector:
         return self.detect([text])[0]
 
 
+def iter_labeled_jsonl(path: Path):
+    """Yield (text, label) pairs from a JSONL file of {"text": ..., "label": ...} objects."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["text"], int(record["label"])
+
+
 def print_report(y_true, y_pred):
     """Print classification report and confusion matrix."""
+    from sklearn.metrics import classification_report, confusion_matrix
+
     print("\nClassification Report:")
     print(classification_report(y_true, y_pred, target_names=["No PII", "Contains PII"]))
 
@@ -0,0 +1,197 @@
+"""
+Cheap PII pre-filter that runs ahead of the embedding call.
+
+Texts pass through up to three stages:
+
+    regex      compiled SSN / email / phone / card patterns; a match is PII
+    linear     logistic regression on hashed word and word-shape features;
+               confident scores outside the (low, high) band are final
+    embedding  everything else goes to the embedding + MLP path
+
+The linear band is calibrated on out-of-fold predictions so that the
+short-circuited decisions reach a target precision. Scoring needs only NumPy
+and the standard library.
+"""
+import re
+import zlib
+from collections import Counter
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src import instrumentation
+except ImportError:
+    import instrumentation
+
+STAGES = ("regex", "linear", "embedding")
+HASH_BITS = 18
+TARGET_PRECISION = 0.99
+
+PATTERNS = {
+    "ssn": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    "email": re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}\b"),
+    "phone": re.compile(r"(?:\+?1[-. ]?)?(?:\(\d{3}\)\s?|\b\d{3}[-.])\d{3}[-.]\d{4}\b"),
+    "card": re.compile(r"\b\d(?:[ -]?\d){12,18}\b"),
+}
+WORD = re.compile(r"\w+|[^\w\s]")
+
+
+def _luhn(number: str) -> bool:
+    digits = [int(c) for c in number if c.isdigit()]
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def match_patterns(text: str) -> list[str]:
+    """Names of the PII patterns found in text (card numbers must pass the Luhn check)."""
+    found = []
+    for name, pattern in PATTERNS.items():
+        if name == "card":
+            if any(_luhn(m.group()) for m in pattern.finditer(text)):
+                found.append(name)
+        elif pattern.search(text):
+            found.append(name)
+    return found
+
+
+def _shape(token: str) -> str:
+    return re.sub(r"[a-z]+", "a", re.sub(r"[A-Z]+", "A", re.sub(r"\d+", "0", token)))
+
+
+def hashed_features(text: str, bits: int = HASH_BITS) -> np.ndarray:
+    """Sorted unique feature indices: lowercased words, word shapes and word bigrams."""
+    tokens = WORD.findall(text)
+    lowered = [t.lower() for t in tokens]
+    features = set(lowered)
+    features.update("s:" + _shape(t) for t in tokens)
+    features.update(f"b:{a} {b}" for a, b in zip(lowered, lowered[1:]))
+    mask = (1 << bits) - 1
+    return np.unique(np.fromiter(
+        (zlib.crc32(f.encode("utf-8")) & mask for f in features), dtype=np.int64, count=len(features)
+    ))
+
+
+def _feature_matrix(texts: list[str], bits: int):
+    from scipy.sparse import csr_matrix
+
+    rows = [hashed_features(t, bits) for t in texts]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(r) for r in rows])
+    indices = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    # Binary features, L2-normalized per text
+    data = np.concatenate([np.full(len(r), 1 / np.sqrt(max(len(r), 1))) for r in rows]) if rows else np.empty(0)
+    return csr_matrix((data, indices, indptr), shape=(len(texts), 1 << bits))
+
+
+def _calibrate(prob: np.ndarray, y: np.ndarray, target: float) -> tuple[float, float]:
+    """
+    Widest (low, high) short-circuit band whose decisions reach target precision.
+
+    high is the lowest score where texts at or above it are PII with precision
+    >= target; low is the highest score where texts at or below it are clean
+    with precision >= target. (-1, 2) short-circuits nothing.
+    """
+    order = np.argsort(-prob)
+    hits = np.cumsum(y[order]) / np.arange(1, len(y) + 1)
+    ok = np.nonzero(hits >= target)[0]
+    high = prob[order[ok[-1]]] if len(ok) else 2.0
+
+    order = np.argsort(prob)
+    clean = np.cumsum(1 - y[order]) / np.arange(1, len(y) + 1)
+    ok = np.nonzero(clean >= target)[0]
+    low = prob[order[ok[-1]]] if len(ok) else -1.0
+
+    if low >= high:
+        return -1.0, 2.0
+    return float(low), float(high)
+
+
+class Prefilter:
+    """Regex + hashed linear model cascade ahead of the embedding path."""
+
+    def __init__(self, weights: np.ndarray = None, bias: float = 0.0, low: float = -1.0,
+                 high: float = 2.0, bits: int = HASH_BITS):
+        self.weights = weights
+        self.bias = bias
+        self.low = low
+        self.high = high
+        self.bits = bits
+        self.counts = Counter()
+
+    def fit(self, texts: list[str], labels, target_precision: float = TARGET_PRECISION, cv: int = 5):
+        """
+        Train the linear stage and calibrate its band on out-of-fold predictions.
+        """
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.model_selection import cross_val_predict
+
+        X = _feature_matrix(texts, self.bits)
+        y = np.asarray(labels)
+        model = LogisticRegression(C=10.0, max_iter=1000)
+        oof = cross_val_predict(model, X, y, cv=cv, method="predict_proba")[:, 1]
+        self.low, self.high = _calibrate(oof, y, target_precision)
+
+        model.fit(X, y)
+        self.weights = model.coef_.ravel().astype(np.float32)
+        self.bias = float(model.intercept_[0])
+        return self
+
+    def linear_prob(self, text: str) -> float:
+        """PII probability from the linear stage alone."""
+        idx = hashed_features(text, self.bits)
+        z = self.bias + float(self.weights[idx].sum()) / np.sqrt(max(len(idx), 1))
+        return float(1 / (1 + np.exp(-z)))
+
+    def route(self, texts: list[str]) -> list[tuple]:
+        """
+        Run the cheap stages.
+
+        Returns:
+            Per text, (stage, prob_pii); prob_pii is None for texts routed to
+            the embedding stage
+        """
+        routes = []
+        for text in texts:
+            if match_patterns(text):
+                routes.append(("regex", 1.0))
+                continue
+            p = self.linear_prob(text)
+            if p >= self.high or p <= self.low:
+                routes.append(("linear", p))
+            else:
+                routes.append(("embedding", None))
+
+        stages = Counter(stage for stage, _ in routes)
+        self.counts.update(stages)
+        for stage, n in stages.items():
+            instrumentation.incr(f"prefilter.{stage}", n)
+        return routes
+
+    def traffic(self) -> dict:
+        """Fraction of texts each stage decided since creation (or the last reset)."""
+        total = sum(self.counts.values())
+        return {stage: self.counts[stage] / total if total else 0.0 for stage in STAGES}
+
+    def reset(self):
+        self.counts.clear()
+
+    def to_compact(self) -> tuple[dict, dict]:
+        """(arrays, meta) for the compact model format."""
+        meta = {"bits": self.bits, "bias": self.bias, "low": self.low, "high": self.high}
+        return {"prefilter_w": self.weights}, meta
+
+    @classmethod
+    def from_compact(cls, arrays: dict, meta: dict) -> "Prefilter":
+        return cls(arrays["prefilter_w"], meta["bias"], meta["low"], meta["high"], meta["bits"])
+
+    def __getstate__(self):
+        # Runtime traffic counts are not part of the model
+        state = self.__dict__.copy()
+        state["counts"] = Counter()
+        return state
@@ -0,0 +1,204 @@
+"""
+Resume Vector Index
+
+Keeps a candidate pool resident as L2-normalized focused vectors (projected onto
+ResumeSimilarity.important_dims) so each query costs one embedding plus a
+matrix-vector product instead of re-embedding the pool. For very large pools an
+optional IVF backend (src/ann.py) replaces the brute-force scan.
+"""
+import numpy as np
+from pathlib import Path
+
+# Handle imports for both package and direct execution
+try:
+    from src.embeddings import top_k_indices
+    from src.embedding_store import as_matrix, CHUNK_ROWS
+    from src.resume_similarity import ResumeSimilarity, match_level
+    from src.ann import IVFIndex
+except ImportError:
+    from embeddings import top_k_indices
+    from embedding_store import as_matrix, CHUNK_ROWS
+    from resume_similarity import ResumeSimilarity, match_level
+    from ann import IVFIndex
+
+
+INDEX_PATH = Path(__file__).parent.parent / "models" / "resume_index.npz"
+
+
+class ResumeIndex:
+    """Searchable pool of resumes with incremental add/remove."""
+
+    def __init__(self, similarity: ResumeSimilarity, index_path: Path = INDEX_PATH):
+        self.similarity = similarity
+        self.index_path = index_path
+        self.ids = []
+        self.vectors = None
+        self.ann = None
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, resume_id) -> bool:
+        return resume_id in self._rows
+
+    def add(self, ids: list, texts: list[str]):
+        """Embed and add resumes. Existing ids are replaced."""
+        if len(ids) != len(texts):
+            raise ValueError("ids and texts must have the same length.")
+        if not ids:
+            return self
+        return self.add_embeddings(ids, self.similarity.embed(texts))
+
+    def add_embeddings(self, ids: list, embeddings):
+        """
+        Add resumes from precomputed full embeddings. Existing ids are replaced.
+
+        Accepts arrays, memmaps or an EmbeddingStore; large inputs are projected
+        in chunks so only the focused vectors are held in memory.
+        """
+        X = as_matrix(embeddings)
+        if len(ids) != len(X):
+            raise ValueError("ids and embeddings must have the same length.")
+        if len(X) > CHUNK_ROWS:
+            for start in range(0, len(X), CHUNK_ROWS):
+                self.add_embeddings(ids[start:start + CHUNK_ROWS], X[start:start + CHUNK_ROWS])
+            return self
+
+        focused = self.similarity.focus(X)
+
+        new_ids, new_vectors, updated = [], [], []
+        for resume_id, vector in dict(zip(ids, focused)).items():
+            row = self._rows.get(resume_id)
+            if row is None:
+                self._rows[resume_id] = len(self.ids) + len(new_ids)
+                new_ids.append(resume_id)
+                new_vectors.append(vector)
+            else:
+                self.vectors[row] = vector
+                updated.append(row)
+
+        if self.ann is not None and updated:
+            self.ann.update(np.array(updated), self.vectors[updated])
+
+        if new_ids:
+            start = len(self.ids)
+            self._reserve(start + len(new_ids), focused.shape[1])
+            self.vectors[start:start + len(new_ids)] = new_vectors
+            self.ids.extend(new_ids)
+            if self.ann is not None:
+                self.ann.add(self.vectors[start:start + len(new_ids)])
+        return self
+
+    def remove(self, ids: list):
+        """Remove resumes by id (swap-with-last, O(1) per id). Unknown ids raise KeyError."""
+        for resume_id in ids:
+            row = self._rows.pop(resume_id)
+            last = len(self.ids) - 1
+            if row != last:
+                moved = self.ids[last]
+                self.vectors[row] = self.vectors[last]
+                self.ids[row] = moved
+                self._rows[moved] = row
+            if self.ann is not None:
+                self.ann.move(last, row)
+            self.ids.pop()
+        return self
+
+    def enable_ann(self, nlist: int = None, nprobe: int = 8, **kwargs):
+        """
+        Build an IVF approximate search backend over the current pool.
+
+        Args:
+            nlist: Number of inverted lists (default ~4*sqrt(N))
+            nprobe: Lists scanned per query; higher means better recall, slower search
+        """
+        if not self.ids:
+            raise ValueError("Add resumes before building the ANN backend.")
+        nlist = nlist or max(1, int(4 * np.sqrt(len(self.ids))))
+        self.ann = IVFIndex(nlist=nlist, nprobe=nprobe, **kwargs).build(self.matrix)
+        return self
+
+    def search(self, query: str, top_k: int = 5, exact: bool = False, nprobe: int = None) -> list[dict]:
+        """
+        Find the most similar indexed resumes to a query resume.
+
+        Uses the ANN backend when enabled unless exact=True.
+
+        Returns:
+            List of dicts with 'id', 'similarity', 'match_level' sorted by similarity
+        """
+        return self.search_embedding(self.similarity.embed([query])[0], top_k, exact=exact, nprobe=nprobe)
+
+    def search_embedding(self, embedding, top_k: int = 5, exact: bool = False, nprobe: int = None) -> list[dict]:
+        """Search with a precomputed full query embedding."""
+        if not self.ids:
+            return []
+        q = self.similarity.focus(embedding)
+        if self.ann is not None and not exact:
+            rows, scores = self.ann.search(self.matrix, q, top_k, nprobe=nprobe)
+        else:
+            scores = self.matrix @ q
+            rows = top_k_indices(scores, top_k)
+            scores = scores[rows]
+        return [
+            {
+                "id": self.ids[row],
+                "similarity": float(score),
+                "match_level": match_level(score),
+            }
+            for row, score in zip(rows, scores)
+        ]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Contiguous float32 view of the live rows."""
+        if self.vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self.vectors[:len(self.ids)]
+
+    def _reserve(self, n: int, dim: int):
+        """Grow the vector buffer geometrically so appends are amortized O(1)."""
+        if self.vectors is None:
+            self.vectors = np.empty((max(n, 1024), dim), dtype=np.float32)
+        elif n > len(self.vectors):
+            grown = np.empty((max(n, 2 * len(self.vectors)), self.vectors.shape[1]), dtype=np.float32)
+            grown[:len(self.ids)] = self.matrix
+            self.vectors = grown
+
+    def save(self, path: Path = None):
+        """Save vectors, ids and important dimensions to disk."""
+        path = path or self.index_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "vectors": self.matrix,
+            "ids": np.asarray(self.ids),
+            "important_dims": np.array(self.similarity.important_dims or [], dtype=np.int64),
+            "backend": np.array(self.similarity.backend or ""),
+        }
+        if self.ann is not None:
+            arrays["ann_centroids"] = self.ann.centroids
+            arrays["ann_labels"] = self.ann.labels
+            arrays["ann_nprobe"] = np.array(self.ann.nprobe)
+        np.savez(path, **arrays)
+        print(f"Index saved to {path}")
+
+    def load(self, path: Path = None):
+        """Load vectors and ids from disk."""
+        path = path or self.index_path
+        data = np.load(path)
+        dims = data["important_dims"].tolist()
+        if dims != list(self.similarity.important_dims or []):
+            raise ValueError("Index was built with different important_dims than the loaded model.")
+        if "backend" in data and str(data["backend"]) != (self.similarity.backend or ""):
+            raise ValueError("Index was built with a different embedding backend than the loaded model.")
+        self.ids = data["ids"].tolist()
+        self.vectors = np.ascontiguousarray(data["vectors"], dtype=np.float32)
+        self._rows = {resume_id: row for row, resume_id in enumerate(self.ids)}
+        self.ann = None
+        if "ann_centroids" in data:
+            centroids = data["ann_centroids"]
+            self.ann = IVFIndex(nlist=len(centroids), nprobe=int(data["ann_nprobe"]))
+            self.ann.centroids = centroids
+            self.ann.labels = data["ann_labels"]
+        return self
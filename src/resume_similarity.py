@@ -5,114 +5,149 @@ Uses embedding-based analysis to find important dimensions for resume matching.
 Compares resumes using focused dimensions that matter for professional similarity.
 """
 import pickle
+import time
 import numpy as np
 from pathlib import Path
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
 
 # Handle imports for both package and direct execution
 try:
-    from src.embeddings import get_embeddings, cosine_similarity
+    from src.embeddings import (
+        get_embeddings, aget_embeddings, cosine_similarity, top_k_indices,
+        backend_id, check_backend, DEFAULT_MODEL,
+    )
+    from src.embedding_store import as_matrix, CHUNK_ROWS
+    from src.model_format import save_arrays, load_arrays, is_compact, default_load_path, file_digest
+    from src import instrumentation
 except ImportError:
-    from embeddings import get_embeddings, cosine_similarity
+    from embeddings import (
+        get_embeddings, aget_embeddings, cosine_similarity, top_k_indices,
+        backend_id, check_backend, DEFAULT_MODEL,
+    )
+    from embedding_store import as_matrix, CHUNK_ROWS
+    from model_format import save_arrays, load_arrays, is_compact, default_load_path, file_digest
+    import instrumentation
 
 
 MODEL_PATH = Path(__file__).parent.parent / "models" / "resume_model.pkl"
 
+# Cap on similar training pairs; larger datasets are subsampled uniformly
+MAX_PAIRS = 200_000
+
+# Dimensions kept: the most important ones covering this share of total importance
+IMPORTANCE_THRESHOLD = 0.90
+
+# Importance engines: sequential gradient boosting, or a parallel extra-trees forest
+# grown in steps with out-of-bag early stopping (supports incremental update())
+ENGINES = ("gradient_boosting", "forest")
+FOREST_STEP = 25
+FOREST_MAX_ESTIMATORS = 400
+
+# Extra-trees importances are spread thinly over all dimensions (90% of the total
+# needs ~1300 of 1536), so the forest engine also caps its selection. 256 dims
+# separate same-field from different-field resumes at least as well as the
+# boosting engine's selection on the bundled data.
+FOREST_MAX_DIMS = 256
+
+# Smallest update() batch; a few pairs would grow trees on almost no data
+MIN_UPDATE_PAIRS = 100
+
 
 class ResumeSimilarity:
     """Calculate resume similarity using learned important dimensions."""
 
-    def __init__(self, model_path: Path = MODEL_PATH):
+    def __init__(self, model_path: Path = MODEL_PATH, dedup=None):
+        """
+        Args:
+            model_path: Model file used by save() and load()
+            dedup: Optional Deduplicator; embed() then embeds one resume per
+                group of duplicates and shares its vector with the group
+        """
         self.model = None
         self.important_dims = None
+        self.backend = None
+        self.dedup = dedup
         self.model_path = model_path
-        self._embed_cache = {}
 
-    def train(self, resume_categories: dict[str, list[str]], test_size: float = 0.2) -> dict:
+    def train(self, resume_categories: dict[str, list[str]], test_size: float = 0.2, embeddings=None,
+              max_pairs: int = MAX_PAIRS, engine: str = "gradient_boosting", n_jobs: int = -1) -> dict:
         """
         Train model to identify which embedding dimensions matter for resume similarity.
 
         Args:
             resume_categories: Dict mapping category names to lists of resume texts
             test_size: Fraction of data for testing
+            embeddings: Optional precomputed embeddings (array, memmap or EmbeddingStore)
+                with one row per resume, in category order
+            max_pairs: Cap on similar pairs; an equal number of dissimilar pairs is sampled
+            engine: "gradient_boosting" or "forest" (parallel, early-stopped, updatable)
+            n_jobs: Worker threads for the forest engine (-1 = all cores)
 
         Returns:
             Dictionary with training metrics and important dimensions
         """
-        # Create pairs
-        print("Creating resume pairs...")
-        similar_pairs, similar_labels = self._create_similar_pairs(resume_categories)
-        dissimilar_pairs, dissimilar_labels = self._create_dissimilar_pairs(resume_categories)
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
 
-        # Balance dataset
-        np.random.seed(42)
-        n_similar = len(similar_pairs)
-        if len(dissimilar_pairs) > n_similar:
-            indices = np.random.choice(len(dissimilar_pairs), n_similar, replace=False)
-            dissimilar_pairs = [dissimilar_pairs[i] for i in indices]
-            dissimilar_labels = [dissimilar_labels[i] for i in indices]
-
-        all_pairs = similar_pairs + dissimilar_pairs
-        all_labels = similar_labels + dissimilar_labels
-
-        print(f"Total pairs: {len(all_pairs)} ({len(similar_pairs)} similar, {len(dissimilar_pairs)} dissimilar)")
-
-        # Get embeddings
-        print("\nGenerating embeddings...")
-        unique_texts = list(set([p[0] for p in all_pairs] + [p[1] for p in all_pairs]))
-        embeddings = get_embeddings(unique_texts)
-        self._embed_cache = {text: emb for text, emb in zip(unique_texts, embeddings)}
+        # Create pairs as row indices into one embedding matrix
+        print("Creating resume pairs...")
+        sizes = np.array([len(resumes) for resumes in resume_categories.values()], dtype=np.int64)
+        rng = np.random.default_rng(42)
+        similar = self._create_similar_pairs(sizes, max_pairs, rng)
+        dissimilar = self._create_dissimilar_pairs(sizes, len(similar), rng)
+        pairs = np.concatenate([similar, dissimilar])
+        y = np.concatenate([np.ones(len(similar), dtype=np.int64), np.zeros(len(dissimilar), dtype=np.int64)])
+
+        print(f"Total pairs: {len(pairs)} ({len(similar)} similar, {len(dissimilar)} dissimilar)")
+
+        # Get embeddings, one row per resume
+        if embeddings is None:
+            print("\nGenerating embeddings...")
+            texts = [r for resumes in resume_categories.values() for r in resumes]
+            unique = {text: i for i, text in enumerate(dict.fromkeys(texts))}
+            self.backend = backend_id()
+            E = get_embeddings(list(unique))
+            rows = np.array([unique[text] for text in texts], dtype=np.intp)
+            pairs = rows[pairs]
+        else:
+            self.backend = getattr(embeddings, "meta", {}).get("model", backend_id())
+            E = as_matrix(embeddings)
 
         # Create feature vectors (absolute difference)
         print("Creating feature vectors...")
-        X = []
-        for r1, r2 in all_pairs:
-            e1 = np.array(self._embed_cache[r1])
-            e2 = np.array(self._embed_cache[r2])
-            diff = np.abs(e1 - e2)
-            X.append(diff)
-
-        X = np.array(X)
-        y = np.array(all_labels)
+        X = self._pair_features(E, pairs)
 
         # Train/test split
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, random_state=42, stratify=y
         )
 
-        # Train GradientBoosting for feature importances
-        print("\nTraining classifier to find important dimensions...")
-        self.model = GradientBoostingClassifier(
-            n_estimators=100,
-            max_depth=4,
-            learning_rate=0.1,
-            random_state=42,
-        )
-        self.model.fit(X_train, y_train)
+        # Train a tree ensemble for feature importances
+        print(f"\nTraining classifier to find important dimensions ({engine})...")
+        start_time = time.perf_counter()
+        if engine == "gradient_boosting":
+            self.model = self._fit_gradient_boosting(X_train, y_train)
+        elif engine == "forest":
+            self.model = self._fit_forest(X_train, y_train, n_jobs)
+        else:
+            raise ValueError(f"Unknown engine '{engine}'. Choose from: {', '.join(ENGINES)}")
+        train_time = time.perf_counter() - start_time
 
         # Evaluate
         y_pred = self.model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
 
-        # Get important dimensions (cumulative 90% importance)
+        # Get important dimensions (cumulative 90% importance, capped for the forest)
         importances = self.model.feature_importances_
-        dim_importance = list(enumerate(importances))
-        dim_importance.sort(key=lambda x: x[1], reverse=True)
-
-        total = sum(importances)
-        cumsum = 0
-        self.important_dims = []
-        for dim, imp in dim_importance:
-            if cumsum < 0.90 * total:
-                self.important_dims.append(dim)
-                cumsum += imp
-            else:
-                break
+        self.important_dims = self._select_dims(importances)
 
         metrics = {
             "accuracy": accuracy,
+            "engine": engine,
+            "n_estimators": len(self._estimators()),
+            "train_time_sec": train_time,
+            # Halves of a sequential booster are not independent ensembles, so only the forest gets a score
+            "dims_stability": self._split_stability() if engine == "forest" else None,
+            "importance_covered": float(importances[self.important_dims].sum() / importances.sum()),
             "total_dimensions": len(importances),
             "important_dimensions": len(self.important_dims),
             "dimension_reduction": f"{(1 - len(self.important_dims) / len(importances)) * 100:.1f}%",
@@ -121,46 +156,239 @@ class ResumeSimilarity:
 
         return metrics, y_test, y_pred
 
-    def _create_similar_pairs(self, categories: dict) -> tuple[list, list]:
-        """Create pairs from same category (similar)."""
-        pairs, labels = [], []
-        for resumes in categories.values():
-            for i in range(len(resumes)):
-                for j in range(i + 1, len(resumes)):
-                    pairs.append((resumes[i], resumes[j]))
-                    labels.append(1)
-        return pairs, labels
-
-    def _create_dissimilar_pairs(self, categories: dict) -> tuple[list, list]:
-        """Create pairs from different categories (dissimilar)."""
-        pairs, labels = [], []
-        cat_list = list(categories.values())
-        for i in range(len(cat_list)):
-            for j in range(i + 1, len(cat_list)):
-                for r1 in cat_list[i]:
-                    for r2 in cat_list[j]:
-                        pairs.append((r1, r2))
-                        labels.append(0)
-        return pairs, labels
+    def update(self, text_pairs: list[tuple[str, str]], labels: list[int],
+               n_estimators: int = FOREST_STEP) -> dict:
+        """
+        Refine important_dims from new labeled pairs without refitting from scratch.
+
+        Adds n_estimators trees fitted on the new pairs to a forest-engine model;
+        existing trees are kept, so importances blend old and new evidence. A
+        model loaded from its compact file is first reloaded from model_path.
+
+        Args:
+            text_pairs: (resume1, resume2) pairs, at least MIN_UPDATE_PAIRS
+            labels: 1 for same field, 0 for different field; both must occur
+
+        Returns:
+            Dict with update time, tree count and the Jaccard overlap between
+            the previous and updated dimension sets
+        """
+        texts = list(dict.fromkeys(t for pair in text_pairs for t in pair))
+        rows = {text: i for i, text in enumerate(texts)}
+        pairs = np.array([(rows[a], rows[b]) for a, b in text_pairs], dtype=np.intp)
+        return self.update_embeddings(self.embed(texts), pairs, labels, n_estimators)
+
+    def update_embeddings(self, embeddings, pairs, labels, n_estimators: int = FOREST_STEP) -> dict:
+        """update() from precomputed embeddings and (n, 2) row-index pairs into them."""
+        if self.model is None and self.important_dims is not None:
+            # Loaded from a compact file, which keeps no trees; the pickle next to it does
+            if self.model_path.exists() and not is_compact(self.model_path):
+                self.load(self.model_path)
+            else:
+                raise ValueError(
+                    "This model was loaded from a compact .bin file, which has no trees to update. "
+                    f"Load it from its .pkl (no .pkl found at {self.model_path})."
+                )
+        if self.model is None or not getattr(self.model, "warm_start", False):
+            raise ValueError("Incremental updates need a model trained with engine='forest'.")
+        labels = np.asarray(labels)
+        if len(labels) < MIN_UPDATE_PAIRS or len(np.unique(labels)) < 2:
+            raise ValueError(
+                f"update() needs at least {MIN_UPDATE_PAIRS} labeled pairs with both labels "
+                f"(got {len(labels)}); collect more pairs or retrain."
+            )
+
+        X = self._pair_features(as_matrix(embeddings), np.asarray(pairs, dtype=np.intp))
+        previous = self.important_dims or []
+        start_time = time.perf_counter()
+        # Out-of-bag scores are undefined once trees are fitted on different data
+        self.model.set_params(n_estimators=self.model.n_estimators + n_estimators, oob_score=False)
+        self.model.fit(X, labels)
+        self.important_dims = self._select_dims(self.model.feature_importances_)
+
+        return {
+            "update_time_sec": time.perf_counter() - start_time,
+            "n_estimators": self.model.n_estimators,
+            "important_dimensions": len(self.important_dims),
+            "dims_stability": jaccard(previous, self.important_dims),
+        }
+
+    @staticmethod
+    def _fit_gradient_boosting(X, y):
+        from sklearn.ensemble import GradientBoostingClassifier
+
+        model = GradientBoostingClassifier(
+            n_estimators=100,
+            max_depth=4,
+            learning_rate=0.1,
+            random_state=42,
+        )
+        return model.fit(X, y)
+
+    @staticmethod
+    def _fit_forest(X, y, n_jobs: int = -1):
+        """Grow an extra-trees forest in steps until the out-of-bag score stops improving."""
+        from sklearn.ensemble import ExtraTreesClassifier
+
+        model = ExtraTreesClassifier(
+            n_estimators=0,
+            max_features="sqrt",
+            min_samples_leaf=2,
+            bootstrap=True,
+            oob_score=True,
+            warm_start=True,
+            n_jobs=n_jobs,
+            random_state=42,
+        )
+        best, stale = -np.inf, 0
+        while model.n_estimators < FOREST_MAX_ESTIMATORS and stale < 2:
+            model.set_params(n_estimators=model.n_estimators + FOREST_STEP)
+            model.fit(X, y)
+            if model.oob_score_ > best + 1e-3:
+                best, stale = model.oob_score_, 0
+            else:
+                stale += 1
+        return model
+
+    def _select_dims(self, importances) -> list[int]:
+        """select_dims() with the engine's cap (the forest engine is the warm-started one)."""
+        forest = getattr(self.model, "warm_start", False)
+        return select_dims(importances, max_dims=FOREST_MAX_DIMS if forest else None)
+
+    def _estimators(self) -> list:
+        """Individual fitted trees of the importance model."""
+        return list(np.ravel(self.model.estimators_))
+
+    def _split_stability(self) -> float:
+        """Jaccard overlap of the dimensions selected by the even- and odd-indexed trees."""
+        trees = self._estimators()
+        if len(trees) < 2:
+            return 1.0
+        halves = [
+            self._select_dims(np.mean([t.feature_importances_ for t in trees[i::2]], axis=0))
+            for i in (0, 1)
+        ]
+        return jaccard(*halves)
+
+    @staticmethod
+    def _create_similar_pairs(sizes: np.ndarray, max_pairs: int, rng) -> np.ndarray:
+        """
+        (n, 2) index pairs from the same category (similar).
+
+        All pairs are used up to max_pairs; beyond that, pairs are sampled uniformly.
+        """
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        total = int((sizes * (sizes - 1) // 2).sum())
+        if total <= max_pairs:
+            return np.concatenate([
+                np.stack(np.triu_indices(n, 1), axis=1) + offset
+                for n, offset in zip(sizes, offsets)
+            ] or [np.empty((0, 2), dtype=np.intp)])
+        # Draw a with weight (n_c - 1), then b uniformly among a's other category members
+        cats = np.repeat(np.arange(len(sizes)), sizes)
+        weights = (sizes - 1)[cats].astype(np.float64)
+        weights /= weights.sum()
+
+        def draw(n):
+            a = rng.choice(len(cats), size=n, p=weights)
+            c = cats[a]
+            b = offsets[c] + rng.integers(0, sizes[c] - 1)
+            b += b >= a
+            return a, b
+
+        return _sample_unique_pairs(draw, max_pairs, len(cats), rng)
+
+    @staticmethod
+    def _create_dissimilar_pairs(sizes: np.ndarray, n_pairs: int, rng) -> np.ndarray:
+        """
+        (n, 2) index pairs from different categories (dissimilar).
+
+        n_pairs are sampled uniformly without building the full cross-category set.
+        """
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        n = int(sizes.sum())
+        total = int((n * n - (sizes * sizes).sum()) // 2)
+        if total <= n_pairs:
+            cats = np.repeat(np.arange(len(sizes)), sizes)
+            i, j = np.triu_indices(n, 1)
+            keep = cats[i] != cats[j]
+            return np.stack([i[keep], j[keep]], axis=1)
+        # Draw a with weight (N - n_c), then b uniformly outside a's category
+        cats = np.repeat(np.arange(len(sizes)), sizes)
+        weights = (n - sizes)[cats].astype(np.float64)
+        weights /= weights.sum()
+
+        def draw(k):
+            a = rng.choice(n, size=k, p=weights)
+            c = cats[a]
+            b = rng.integers(0, n - sizes[c])
+            b += (b >= offsets[c]) * sizes[c]
+            return a, b
+
+        return _sample_unique_pairs(draw, n_pairs, n, rng)
+
+    @staticmethod
+    def _pair_features(E, pairs: np.ndarray) -> np.ndarray:
+        """|E[i] - E[j]| for every (i, j) pair, gathered with fancy indexing in chunks."""
+        X = np.empty((len(pairs), E.shape[1]), dtype=np.float32)
+        for start in range(0, len(pairs), CHUNK_ROWS):
+            block = pairs[start:start + CHUNK_ROWS]
+            out = X[start:start + CHUNK_ROWS]
+            np.subtract(E[block[:, 0]], E[block[:, 1]], out=out)
+            np.abs(out, out=out)
+        return X
 
     def save(self, path: Path = None):
-        """Save model and important dimensions to disk."""
+        """Save model and important dimensions to disk, plus a compact copy next to it."""
         path = path or self.model_path
         path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "wb") as f:
             pickle.dump({
                 "model": self.model,
                 "important_dims": self.important_dims,
+                "backend": self.backend,
             }, f)
         print(f"Model saved to {path}")
+        self.save_compact(path.with_suffix(".bin"), source=path)
+
+    def save_compact(self, path: Path = None, source: Path = None):
+        """
+        Save important dimensions in the pickle-free compact format.
+
+        source is the pickle this copy was made from; its hash is recorded.
+        """
+        path = path or self.model_path.with_suffix(".bin")
+        arrays = {"important_dims": np.asarray(self.important_dims or [], dtype=np.int32)}
+        if self.model is not None:
+            arrays["feature_importances"] = np.asarray(self.model.feature_importances_, dtype=np.float32)
+        meta = {"type": "resume_dims", "backend": self.backend}
+        if source is not None:
+            meta["source_sha256"] = file_digest(source)
+        save_arrays(path, arrays, meta=meta)
+        print(f"Compact model saved to {path}")
 
     def load(self, path: Path = None):
-        """Load model and important dimensions from disk."""
-        path = path or self.model_path
+        """
+        Load model and important dimensions from disk.
+
+        Compact (.bin) files load only the important dimensions, without sklearn.
+        With no path, the compact copy is preferred when it was converted from
+        the current pickle (see model_format.default_load_path).
+        """
+        path = path or default_load_path(self.model_path)
+        if is_compact(path):
+            arrays, meta = load_arrays(path, mmap=False)
+            self.model = None
+            self.important_dims = arrays["important_dims"].tolist()
+            self.backend = meta.get("backend") or DEFAULT_MODEL
+            return self
+
         with open(path, "rb") as f:
             data = pickle.load(f)
         self.model = data["model"]
         self.important_dims = data["important_dims"]
+        # Models saved before backends were recorded were trained on OpenAI embeddings
+        self.backend = data.get("backend") or DEFAULT_MODEL
         return self
 
     def compare(self, resume1: str, resume2: str) -> dict:
@@ -170,33 +398,31 @@ class ResumeSimilarity:
         Returns:
             Dict with full similarity, focused similarity, and recommendation
         """
-        embeddings = get_embeddings([resume1, resume2])
-        e1 = np.array(embeddings[0])
-        e2 = np.array(embeddings[1])
-
-        # Full similarity
-        full_sim = cosine_similarity(e1.tolist(), e2.tolist())
-
-        # Focused similarity (important dimensions only)
-        if self.important_dims:
-            e1_focused = e1[self.important_dims]
-            e2_focused = e2[self.important_dims]
-            focused_sim = cosine_similarity(e1_focused.tolist(), e2_focused.tolist())
-        else:
-            focused_sim = full_sim
-
-        # Recommendation
-        if focused_sim > 0.7:
-            match_level = "High"
-        elif focused_sim > 0.5:
-            match_level = "Medium"
-        else:
-            match_level = "Low"
+        embeddings = self.embed([resume1, resume2])
+        return self._compare_embeddings(embeddings[0], embeddings[1])
+
+    async def acompare(self, resume1: str, resume2: str) -> dict:
+        """Async version of compare()."""
+        embeddings = await self.aembed([resume1, resume2])
+        return self._compare_embeddings(embeddings[0], embeddings[1])
+
+    def _compare_embeddings(self, e1: np.ndarray, e2: np.ndarray) -> dict:
+        """Compare two precomputed resume embeddings."""
+        instrumentation.incr("resume.comparisons")
+        with instrumentation.timer("resume.score"):
+            # Full similarity
+            full_sim = cosine_similarity(e1, e2)
+
+            # Focused similarity (important dimensions only)
+            if self.important_dims:
+                focused_sim = cosine_similarity(e1[self.important_dims], e2[self.important_dims])
+            else:
+                focused_sim = full_sim
 
         return {
             "full_similarity": float(full_sim),
             "focused_similarity": float(focused_sim),
-            "match_level": match_level,
+            "match_level": match_level(focused_sim),
             "dimensions_used": len(self.important_dims) if self.important_dims else "all",
         }
 
@@ -204,17 +430,108 @@ class ResumeSimilarity:
         """
         Find most similar resumes from candidates.
 
+        The target and all candidates are embedded in one batch, and focused
+        similarities are computed as a single matrix-vector product.
+
         Returns:
             List of dicts with candidate info sorted by similarity
         """
-        results = []
-        for candidate in candidates:
-            comparison = self.compare(target_resume, candidate)
-            results.append({
-                "resume": candidate[:100] + "..." if len(candidate) > 100 else candidate,
-                "similarity": comparison["focused_similarity"],
-                "match_level": comparison["match_level"],
-            })
-
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        return results[:top_k]
+        if not candidates:
+            return []
+        embeddings = self.embed([target_resume] + candidates)
+        return self._rank(candidates, embeddings, top_k)
+
+    async def afind_similar(self, target_resume: str, candidates: list[str], top_k: int = 5) -> list[dict]:
+        """Async version of find_similar()."""
+        if not candidates:
+            return []
+        embeddings = await self.aembed([target_resume] + candidates)
+        return self._rank(candidates, embeddings, top_k)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts with the active backend, checking it matches the trained one."""
+        if self.backend:
+            check_backend(self.backend)
+        if self.dedup is None:
+            with instrumentation.timer("resume.embed"):
+                return get_embeddings(texts)
+        representatives, assign = self.dedup.group(texts)
+        with instrumentation.timer("resume.embed"):
+            return get_embeddings([texts[i] for i in representatives])[assign]
+
+    async def aembed(self, texts: list[str]) -> np.ndarray:
+        if self.backend:
+            check_backend(self.backend)
+        if self.dedup is None:
+            with instrumentation.timer("resume.embed"):
+                return await aget_embeddings(texts)
+        representatives, assign = self.dedup.group(texts)
+        with instrumentation.timer("resume.embed"):
+            return (await aget_embeddings([texts[i] for i in representatives]))[assign]
+
+    def focus(self, embeddings) -> np.ndarray:
+        """Project embeddings onto important dimensions and L2-normalize rows."""
+        X = np.asarray(embeddings, dtype=np.float32)
+        if self.important_dims:
+            X = X[..., self.important_dims]
+        norms = np.linalg.norm(X, axis=-1, keepdims=True)
+        return X / np.maximum(norms, 1e-12)
+
+    def _rank(self, candidates: list[str], embeddings: np.ndarray, top_k: int) -> list[dict]:
+        """Rank candidates by focused similarity to the target (first embedding)."""
+        instrumentation.incr("resume.candidates", len(candidates))
+        with instrumentation.timer("resume.focus"):
+            X = self.focus(embeddings)
+        with instrumentation.timer("resume.score"):
+            scores = X[1:] @ X[0]
+            top = top_k_indices(scores, top_k)
+
+        with instrumentation.timer("resume.postprocess"):
+            results = []
+            for i in top:
+                candidate = candidates[i]
+                results.append({
+                    "resume": candidate[:100] + "..." if len(candidate) > 100 else candidate,
+                    "similarity": float(scores[i]),
+                    "match_level": match_level(scores[i]),
+                })
+        return results
+
+
+def _sample_unique_pairs(draw, n_pairs: int, n: int, rng) -> np.ndarray:
+    """Collect n_pairs distinct unordered pairs from draw(k) -> (a, b), in random order."""
+    keys = np.empty(0, dtype=np.int64)
+    while len(keys) < n_pairs:
+        a, b = draw(2 * (n_pairs - len(keys)) + 16)
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        keys = np.unique(np.concatenate([keys, lo.astype(np.int64) * n + hi]))
+    keys = rng.permutation(keys)[:n_pairs]
+    return np.stack([keys // n, keys % n], axis=1).astype(np.intp)
+
+
+def select_dims(importances, threshold: float = IMPORTANCE_THRESHOLD, max_dims: int = None) -> list[int]:
+    """
+    Most important dimensions, in decreasing order, covering threshold of the
+    total importance (at most max_dims of them).
+    """
+    importances = np.asarray(importances, dtype=np.float64)
+    order = np.argsort(-importances, kind="stable")
+    cumsum = np.cumsum(importances[order])
+    # Keep dimensions while the importance accumulated before them is under the threshold
+    n = int(np.searchsorted(cumsum, threshold * importances.sum(), side="left")) + 1
+    return order[:min(n, len(order), max_dims or len(order))].tolist()
+
+
+def jaccard(a, b) -> float:
+    """Jaccard overlap of two dimension sets."""
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def match_level(similarity: float) -> str:
+    """Map a focused similarity score to a recommendation level."""
+    if similarity > 0.7:
+        return "High"
+    elif similarity > 0.5:
+        return "Medium"
+    return "Low"
@@ -0,0 +1,256 @@
+"""
+PII detection server with micro-batching.
+
+A single loaded PIIDetector serves concurrent HTTP requests. Requests are queued
+and a background thread groups them into micro-batches (up to max_batch_size
+texts or max_wait_ms of waiting), so each batch costs one get_embeddings call
+and one forward pass.
+
+Endpoints:
+    POST /detect   {"texts": [...]} or {"text": "..."}  ->  {"results": [...]}
+    GET  /metrics  queue depth, batch size histogram, latency percentiles
+    GET  /metrics/prometheus  the same plus pipeline stage timers (src/instrumentation.py)
+                              in Prometheus text format
+    GET  /health
+"""
+import json
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Handle imports for both package and direct execution
+try:
+    from src import instrumentation
+except ImportError:
+    import instrumentation
+
+
+class MicroBatcher:
+    """Groups concurrent detect requests into batched detector calls."""
+
+    def __init__(self, detector, max_batch_size: int = 64, max_wait_ms: float = 5.0,
+                 latency_window: int = 10_000):
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_sizes = Counter()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.errors = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list[str]) -> Future:
+        """Queue texts for detection; the future resolves to the per-text results."""
+        future = Future()
+        self._queue.put((texts, future, time.perf_counter()))
+        return future
+
+    def detect(self, texts: list[str], timeout: float = None) -> list[dict]:
+        return self.submit(texts).result(timeout)
+
+    def close(self):
+        self._running = False
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self) -> list:
+        """Block for one request, then gather more until the batch is full or the wait expires."""
+        item = self._queue.get()
+        if item is None:
+            return []
+        batch, size = [item], len(item[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            texts = [text for item_texts, _, _ in batch for text in item_texts]
+            try:
+                results = self.detector.detect(texts) if texts else []
+            except Exception as e:
+                with self._lock:
+                    self.errors += len(batch)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            now = time.perf_counter()
+            with self._lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.texts += len(texts)
+                self._batch_sizes[_bucket(len(texts))] += 1
+                self._latencies.extend(now - submitted for _, _, submitted in batch)
+
+            start = 0
+            for item_texts, future, _ in batch:
+                future.set_result(results[start:start + len(item_texts)])
+                start += len(item_texts)
+
+    def metrics(self) -> dict:
+        """Queue depth, counters, batch size histogram and latency percentiles (ms)."""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            histogram = {f"<={b}": self._batch_sizes[b] for b in sorted(self._batch_sizes)}
+            metrics = {
+                "queue_depth": self._queue.qsize(),
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "errors": self.errors,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "batch_size_histogram": histogram,
+            }
+        for p in (50, 90, 95, 99):
+            metrics[f"latency_p{p}_ms"] = float(np.percentile(latencies, p)) if len(latencies) else 0.0
+        if self.detector.prefilter is not None:
+            metrics["prefilter_traffic"] = self.detector.prefilter.traffic()
+        if self.detector.dedup is not None:
+            metrics["dedup_ratio"] = self.detector.dedup.ratio()
+            metrics["dedup_ratio_last_batch"] = self.detector.dedup.last_ratio
+        return metrics
+
+
+def _bucket(n: int) -> int:
+    """Power-of-two histogram bucket holding n."""
+    bucket = 1
+    while bucket < n:
+        bucket *= 2
+    return bucket
+
+
+def prometheus_metrics(batcher: MicroBatcher) -> str:
+    """Batcher gauges and counters plus instrumentation stage timers, as Prometheus text."""
+    metrics = batcher.metrics()
+    prefix = instrumentation.PREFIX + "_server"
+    lines = []
+    for name in ("requests", "texts", "batches", "errors"):
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.append(f"{prefix}_{name}_total {metrics[name]}")
+    for name in ("queue_depth", "mean_batch_size", "latency_p50_ms", "latency_p99_ms"):
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.append(f"{prefix}_{name} {metrics[name]}")
+    return "\n".join(lines) + "\n" + instrumentation.to_prometheus()
+
+
+class DetectHandler(BaseHTTPRequestHandler):
+    """HTTP handler; the server carries the MicroBatcher as `batcher`."""
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(200, self.server.batcher.metrics())
+        elif self.path == "/metrics/prometheus":
+            self._send_text(200, prometheus_metrics(self.server.batcher))
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/detect":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("body must be a JSON object")
+            texts = body["texts"] if "texts" in body else [body["text"]]
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                raise ValueError("'texts' must be a list of strings")
+        except (ValueError, KeyError) as e:
+            self._send(400, {"error": f"invalid request: {e}"})
+            return
+        try:
+            results = self.server.batcher.detect(texts)
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+        self._send(200, {"results": results})
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status: int, text: str):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = socket.SOMAXCONN
+
+
+class TCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The socketserver default backlog of 5 resets connections under concurrent load
+    request_queue_size = socket.SOMAXCONN
+
+
+def make_server(batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8080,
+                unix_socket: str = None, verbose: bool = False, backlog: int = None):
+    """
+    Create (but do not start) an HTTP server bound to host:port or a Unix socket.
+
+    backlog is the listen queue length (default: socket.SOMAXCONN).
+    """
+    if unix_socket:
+        server = UnixHTTPServer(unix_socket, DetectHandler, bind_and_activate=False)
+    else:
+        server = TCPHTTPServer((host, port), DetectHandler, bind_and_activate=False)
+    if backlog:
+        server.request_queue_size = backlog
+    try:
+        server.server_bind()
+        server.server_activate()
+    except BaseException:
+        server.server_close()
+        raise
+    server.batcher = batcher
+    server.verbose = verbose
+    return server
@@ -0,0 +1,120 @@
+"""
+Streaming PII scanning.
+
+Reads a binary stream incrementally, segments it into paragraph/sentence windows
+with byte offsets, and classifies the windows in batches. Memory stays bounded
+by the read block size plus one window, regardless of input size.
+"""
+import re
+from itertools import islice
+
+READ_BLOCK = 64 * 1024
+MAX_SEGMENT_BYTES = 2000
+
+PARAGRAPH_BREAK = re.compile(rb"\n[ \t\r\f\v]*\n")
+SENTENCE_BREAK = re.compile(rb"(?<=[.!?])\s+")
+
+
+def _utf8_boundary(data: bytes, pos: int) -> int:
+    """Move pos back so it does not split a UTF-8 multi-byte character."""
+    while 0 < pos < len(data) and (data[pos] & 0xC0) == 0x80:
+        pos -= 1
+    return pos
+
+
+def _split(data: bytes, max_bytes: int) -> list[tuple[int, int]]:
+    """
+    Split a paragraph into windows of at most max_bytes.
+
+    Sentences are packed greedily; sentences longer than max_bytes are hard-split.
+
+    Returns:
+        List of (start, end) byte ranges relative to data
+    """
+    sentences = []
+    start = 0
+    for m in SENTENCE_BREAK.finditer(data):
+        sentences.append((start, m.start()))
+        start = m.end()
+    sentences.append((start, len(data)))
+
+    windows = []
+    for s, e in sentences:
+        if windows and e - windows[-1][0] <= max_bytes:
+            windows[-1] = (windows[-1][0], e)
+            continue
+        while e - s > max_bytes:
+            cut = _utf8_boundary(data, s + max_bytes)
+            if cut <= s:
+                cut = s + max_bytes
+            windows.append((s, cut))
+            s = cut
+        windows.append((s, e))
+    return windows
+
+
+def _emit(data: bytes, base: int, max_bytes: int):
+    """Yield stripped, non-empty windows of data as (start, end, text) with absolute offsets."""
+    for s, e in _split(data, max_bytes):
+        chunk = data[s:e]
+        stripped = chunk.strip()
+        if not stripped:
+            continue
+        lead = len(chunk) - len(chunk.lstrip())
+        start = base + s + lead
+        yield start, start + len(stripped), stripped.decode("utf-8", errors="replace")
+
+
+def iter_segments(stream, max_bytes: int = MAX_SEGMENT_BYTES, block_size: int = READ_BLOCK):
+    """
+    Segment a binary stream into paragraph/sentence windows.
+
+    Yields:
+        (start_byte, end_byte, text) tuples in stream order
+    """
+    buf = b""
+    base = 0
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        buf += block
+
+        # Emit complete paragraphs; the trailing one may still be growing
+        pos = 0
+        for m in PARAGRAPH_BREAK.finditer(buf):
+            yield from _emit(buf[pos:m.start()], base + pos, max_bytes)
+            pos = m.end()
+        buf = buf[pos:]
+        base += pos
+
+        # Bound memory on very long paragraphs: flush all but the last window
+        if len(buf) > max_bytes:
+            windows = _split(buf, max_bytes)
+            keep = windows[-1][0]
+            yield from _emit(buf[:keep], base, max_bytes)
+            buf = buf[keep:]
+            base += keep
+
+    if buf:
+        yield from _emit(buf, base, max_bytes)
+
+
+def batched(iterable, n: int):
+    """Yield lists of up to n items."""
+    it = iter(iterable)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def scan_stream(detector, stream, batch_size: int = 64, max_bytes: int = MAX_SEGMENT_BYTES):
+    """
+    Classify a stream segment by segment.
+
+    Yields:
+        Dicts with 'start', 'end', 'text', 'contains_pii', 'confidence', 'prob_pii'
+    """
+    for batch in batched(iter_segments(stream, max_bytes=max_bytes), batch_size):
+        results = detector.detect([text for _, _, text in batch])
+        for (start, end, _), result in zip(batch, results):
+            yield {"start": start, "end": end, **result}
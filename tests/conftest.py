@@ -0,0 +1,51 @@
+"""
+Shared fixtures.
+
+Every test runs against the local HashingBackend with a throwaway embedding
+cache, so no API key, network access or trained model is needed.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import embeddings, instrumentation
+from src.embeddings import HashingBackend
+from src.inference import MLPInference
+from src.pii_detector import PIIDetector
+
+DIM = 64
+
+
+@pytest.fixture(autouse=True)
+def hashing_backend(tmp_path, monkeypatch):
+    """Isolated embedding state: hashing backend, private cache, no .env."""
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(embeddings, "_env_loaded", True)
+    monkeypatch.setattr(embeddings, "_cache", None)
+    backend = HashingBackend(dim=DIM)
+    embeddings.set_backend(backend)
+    yield backend
+    embeddings.set_backend(None)
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def random_engine(dim: int = DIM, hidden: tuple = (32, 16), seed: int = 0) -> MLPInference:
+    rng = np.random.default_rng(seed)
+    sizes = (dim,) + hidden + (1,)
+    weights = [rng.standard_normal((a, b)) / np.sqrt(a) for a, b in zip(sizes[:-1], sizes[1:])]
+    biases = [np.zeros(b) for b in sizes[1:]]
+    return MLPInference(weights, biases)
+
+
+@pytest.fixture
+def detector(hashing_backend, tmp_path):
+    """PIIDetector with random weights on the hashing backend."""
+    detector = PIIDetector(model_path=tmp_path / "pii_model.pkl")
+    detector.engine = random_engine()
+    detector.backend = hashing_backend.key()
+    return detector
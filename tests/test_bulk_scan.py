@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from conftest import random_engine
+from src import embeddings
+from src.bulk_scan import bulk_scan
+from src.embeddings import HashingBackend
+from src.pii_detector import PIIDetector
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch):
+    # Workers load the compact model and pick the backend from the environment
+    monkeypatch.setenv("EMBEDDING_BACKEND", "hashing")
+    embeddings.set_backend(HashingBackend())
+    detector = PIIDetector(model_path=tmp_path / "pii_model.pkl")
+    detector.engine = random_engine(dim=HashingBackend().dim)
+    detector.backend = HashingBackend().key()
+    detector.save_compact(tmp_path / "pii_model.bin")
+    return tmp_path / "pii_model.pkl"
+
+
+@pytest.fixture
+def files(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    paths = []
+    for i in range(4):
+        path = data / f"log{i}.txt"
+        path.write_text(f"line {i}\ncontact me at user{i}@example.com\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_skipped_counts_only_files_in_this_scan(tmp_path, model_path, files):
+    data = str(tmp_path / "data")
+    # Two files of this scan are done; the other entries belong to an earlier, wider scan
+    checkpoint = tmp_path / "checkpoint.txt"
+    checkpoint.write_text("".join(p + "\n" for p in files[:2] + [f"/elsewhere/old{i}.txt" for i in range(3)]))
+    report = tmp_path / "report.jsonl"
+
+    stats = bulk_scan([data], report, workers=1, checkpoint=checkpoint, model_path=model_path)
+    assert (stats["files"], stats["skipped"]) == (2, 2)
+    assert {json.loads(line)["file"] for line in report.read_text().splitlines()} == set(files[2:])
+
+    stats = bulk_scan([data], report, workers=1, checkpoint=checkpoint, model_path=model_path)
+    assert (stats["files"], stats["skipped"]) == (0, 4)
+
+
+@pytest.mark.parametrize("name", ["report.jsonl", "report.csv"])
+def test_report_is_rewritten_without_checkpoint(tmp_path, model_path, files, name):
+    report = tmp_path / name
+    bulk_scan([str(tmp_path / "data")], report, workers=1, model_path=model_path)
+    first = report.read_text()
+    bulk_scan([str(tmp_path / "data")], report, workers=1, model_path=model_path)
+    assert len(report.read_text().splitlines()) == len(first.splitlines()) >= len(files)
+
+
+def test_resumed_scan_appends(tmp_path, model_path, files):
+    report = tmp_path / "report.csv"
+    checkpoint = tmp_path / "checkpoint.txt"
+    bulk_scan(files[:2], report, workers=1, checkpoint=checkpoint, model_path=model_path)
+    bulk_scan(files, report, workers=1, checkpoint=checkpoint, model_path=model_path)
+    lines = report.read_text().splitlines()
+    assert lines[0].startswith("file,") and sum(line.startswith("file,") for line in lines) == 1
+    assert {line.split(",")[0] for line in lines[1:]} == set(files)
@@ -0,0 +1,22 @@
+import io
+import sys
+
+import detect
+from src.pii_detector import PIIDetector
+
+from conftest import random_engine
+
+
+def test_file_dash_reads_stdin(hashing_backend, monkeypatch, capsys):
+    def load(self, path=None):
+        self.engine = random_engine()
+        self.backend = hashing_backend.key()
+        return self
+
+    monkeypatch.setattr(PIIDetector, "load", load)
+    for extra in ([], ["--spans", "--flat"]):
+        monkeypatch.setattr(sys, "stdin", io.StringIO("Call me at 555-123-4567\n"))
+        monkeypatch.setattr(sys, "argv", ["detect.py", *extra, "-f", "-"])
+        detect.main()
+        out = capsys.readouterr().out
+        assert "555-123-4567" in out
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.dedup import Deduplicator, canonicalize, fan_out
+from src.prefilter import Prefilter, HASH_BITS
+
+CARD = "Build #4532015112830366 passed all unit tests."
+SHORT_ID = "Build #12 passed all unit tests."
+
+
+def pass_through_prefilter() -> Prefilter:
+    """Pre-filter whose linear stage decides nothing (only the regex stage is active)."""
+    return Prefilter(np.zeros(1 << HASH_BITS, dtype=np.float32), 0.0, -1.0, 2.0)
+
+
+def test_canonicalize_masks_volatile_tokens():
+    a = canonicalize("Ticket #4512 opened at 2024-03-01T12:00:01Z:  disk full")
+    b = canonicalize("ticket #9981 opened at 2024-03-02T08:15:44Z: Disk full")
+    assert a == b == "ticket #<id> opened at <timestamp>: disk full"
+
+
+def test_long_numbers_are_not_masked():
+    assert "4532015112830366" in canonicalize(CARD)
+    assert "1234567" in canonicalize("Member #1234567 renewed")
+    assert canonicalize("Ref ORD-2024-5678 shipped") == "ref <id> shipped"
+
+
+def test_pii_number_is_not_grouped_with_short_id():
+    for near in (False, True):
+        representatives, assign = Deduplicator(near=near).group([CARD, SHORT_ID])
+        assert representatives == [0, 1]
+        assert list(assign) == [0, 1]
+
+
+def test_pii_number_keeps_its_own_verdict(detector):
+    detector.prefilter = pass_through_prefilter()
+    alone = detector.detect([CARD])[0]
+    assert alone["stage"] == "regex" and alone["contains_pii"]
+
+    detector.dedup = Deduplicator()
+    for texts in ([SHORT_ID, CARD], [CARD, SHORT_ID]):
+        results = {r["text"]: r for r in detector.detect(texts)}
+        assert results[CARD]["stage"] == "regex"
+        assert results[CARD]["contains_pii"]
+
+
+def test_exact_duplicates_share_one_embedding(detector):
+    texts = ["Disk full on host", "disk  FULL on host", "Backup finished", "Disk full on host"]
+    dedup = Deduplicator()
+    detector.dedup = dedup
+    results = detector.detect(texts)
+    assert [r["text"] for r in results] == texts
+    assert results[0]["prob_pii"] == results[1]["prob_pii"] == results[3]["prob_pii"]
+    assert dedup.last_ratio == 0.5
+
+
+def test_near_duplicates_collapse():
+    base = (
+        "The nightly build pipeline failed on the integration tests after the merge of the caching layer. "
+        "Logs were attached to the incident and the on-call engineer restarted the runners, cleared the "
+        "artifact cache, re-ran the failing suites twice and confirmed that the flaky database fixture was "
+        "the root cause of the failure."
+    )
+    dedup = Deduplicator(near=True)
+    representatives, assign = dedup.group([base, base[:-1], "Quarterly budget review moved to Friday"])
+    assert representatives == [0, 2]
+    assert list(assign) == [0, 0, 1]
+
+
+def test_per_batch_callback_and_ratios():
+    batches = []
+    dedup = Deduplicator(on_batch=lambda texts, unique: batches.append((texts, unique)))
+    dedup.group(["a", "A", "b"])
+    assert dedup.last_ratio == pytest.approx(1 / 3)
+    dedup.group(["c", "d"])
+    assert dedup.last_ratio == 0.0
+    assert batches == [(3, 2), (2, 2)]
+    assert dedup.ratio() == pytest.approx(1 / 5)
+
+
+def test_fan_out_keeps_member_text():
+    results = fan_out(["x", "X"], [{"text": "x", "prob_pii": 0.2}], np.array([0, 0]))
+    assert results == [{"text": "x", "prob_pii": 0.2}, {"text": "X", "prob_pii": 0.2}]
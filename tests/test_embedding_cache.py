@@ -0,0 +1,24 @@
+import numpy as np
+
+from src.embedding_cache import EmbeddingCache
+
+
+def test_round_trip_and_lru(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.db", max_entries=3)
+    vectors = np.arange(8, dtype=np.float32).reshape(4, 2)
+    cache.put_many(["a", "b", "c"], "m", vectors[:3])
+    assert cache.get_many(["a"], "m")[0].tolist() == [0, 1]  # "a" is now most recently used
+    cache.put_many(["d"], "m", vectors[3:])
+    assert [v is not None for v in cache.get_many(["a", "b", "c", "d"], "m")] == [True, False, True, True]
+    assert cache.get_many(["a"], "other")[0] is None
+
+
+def test_bound_holds_across_connections(tmp_path):
+    # Separate connections stand in for pool workers sharing one cache file
+    path = tmp_path / "cache.db"
+    caches = [EmbeddingCache(path, max_entries=10) for _ in range(3)]
+    for i, cache in enumerate(caches):
+        texts = [f"text {i}-{j}" for j in range(8)]
+        cache.put_many(texts, "m", np.ones((8, 4), dtype=np.float32))
+        assert len(cache) <= 10
+    assert len(EmbeddingCache(path, max_entries=10)) == 10
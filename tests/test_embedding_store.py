@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from src.embedding_store import EmbeddingStore, as_matrix
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_read_while_appending(tmp_path, dtype):
+    E = np.random.default_rng(0).standard_normal((10, 4)).astype(np.float32)
+    store = EmbeddingStore.create(tmp_path / "emb.bin", dim=4, dtype=dtype)
+    store.append(E[:6])
+    np.testing.assert_allclose(store.array, E[:6], atol=1e-2)
+    store.append(E[6:])
+    np.testing.assert_allclose(as_matrix(store), E, atol=1e-2)
+    assert [start for start, _ in store.iter_chunks(4)] == [0, 4, 8]
+    store.close()
+
+    reopened = EmbeddingStore(tmp_path / "emb.bin")
+    assert reopened.shape == (10, 4)
+    np.testing.assert_array_equal(reopened.array, store.array)
+
+
+def test_rejects_wrong_dimension(tmp_path):
+    store = EmbeddingStore.create(tmp_path / "emb.bin", dim=4)
+    with pytest.raises(ValueError, match="dimension 4"):
+        store.append(np.zeros((2, 3)))
@@ -0,0 +1,115 @@
+import asyncio
+import base64
+import random
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src import embeddings
+from src.embeddings import OpenAIBackend, aget_embeddings, get_cache
+
+
+def vector(text: str, dim: int) -> np.ndarray:
+    return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(dim).astype(np.float32)
+
+
+class FakeAsyncClient:
+    """AsyncOpenAI stand-in: base64 vectors, items in shuffled order, tracks requests in flight."""
+
+    def __init__(self, dim: int, fail_first: bool = False):
+        self.dim = dim
+        self.fail_first = fail_first
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested = []
+        self.embeddings = SimpleNamespace(create=self.create)
+
+    async def create(self, input, model, encoding_format):
+        assert encoding_format == "base64"
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.005))
+            if self.fail_first:
+                self.fail_first = False
+                raise ConnectionError("transient")
+            self.requested.extend(input)
+            data = [
+                SimpleNamespace(index=i, embedding=base64.b64encode(vector(t, self.dim).tobytes()).decode("ascii"))
+                for i, t in enumerate(input)
+            ]
+            random.shuffle(data)
+            return SimpleNamespace(data=data, usage=None)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(dim: int, limit: int, chunk: int, **kwargs):
+        client = FakeAsyncClient(dim, **kwargs)
+        monkeypatch.setattr(embeddings, "get_async_client", lambda: client)
+        monkeypatch.setattr(embeddings, "_retryable_errors", lambda: (ConnectionError,))
+        monkeypatch.setattr(embeddings, "RETRY_BASE_DELAY", 0.0)
+        monkeypatch.setattr(
+            embeddings, "chunk_texts",
+            lambda texts: [(start, min(start + chunk, len(texts))) for start in range(0, len(texts), chunk)],
+        )
+        monkeypatch.setattr(embeddings, "_async_limiter", None)
+        monkeypatch.setenv("EMBEDDING_MAX_CONCURRENCY", str(limit))
+        embeddings.set_backend(OpenAIBackend())
+        return client
+    return install
+
+
+@pytest.mark.parametrize("model, dim", [("text-embedding-3-small", 1536), ("custom-model", 8)])
+def test_async_limit_order_and_cache_merge(fake_client, model, dim):
+    client = fake_client(dim, limit=3, chunk=2, fail_first=True)
+    texts = [f"text {i}" for i in range(40)]
+    cached = texts[::5]
+    get_cache().put_many(cached, OpenAIBackend().key(model), np.stack([vector(t, dim) for t in cached]))
+
+    batch = texts + texts[:10]
+    out = asyncio.run(aget_embeddings(batch, model=model))
+
+    assert out.dtype == np.float32 and out.shape == (len(batch), dim)
+    np.testing.assert_array_equal(out, np.stack([vector(t, dim) for t in batch]))
+    # Cache hits and in-batch duplicates are never sent, even after a retried chunk
+    assert sorted(client.requested) == sorted(t for t in texts if t not in cached)
+    assert client.max_in_flight == 3
+
+
+def test_async_cache_only(fake_client):
+    client = fake_client(8, limit=2, chunk=4)
+    texts = ["a", "b", "c"]
+    first = asyncio.run(aget_embeddings(texts, model="custom-model"))
+    second = asyncio.run(aget_embeddings(texts[::-1], model="custom-model"))
+    np.testing.assert_array_equal(second, first[::-1])
+    assert client.requested == texts
+
+
+@pytest.mark.parametrize("text", ["plain ascii " * 200, "日本語" * 1000, "Привет мир " * 300, "🙂" * 500])
+def test_token_estimate_never_undercounts(text, monkeypatch):
+    # Without tiktoken the byte-length fallback must still bound the real count
+    monkeypatch.setattr(embeddings, "_encoding", False)
+    assert embeddings.estimate_tokens(text) >= len(text.encode("utf-8"))
+    chunks = embeddings.chunk_texts([text] * 400, max_tokens=len(text.encode("utf-8")) * 100)
+    assert all(end - start <= 99 for start, end in chunks)
+
+
+def test_empty_batch_has_backend_width(detector):
+    assert embeddings.get_embeddings([]).shape == (0, 64)
+    assert asyncio.run(aget_embeddings([], model="custom-model")).shape == (0, 64)
+    assert len(detector.score_texts([])) == 0
+
+
+def test_empty_batch_probes_unknown_model_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(embeddings, "_embed_uncached", lambda texts, model: calls.append(texts) or np.zeros((1, 8)))
+    embeddings.set_backend(OpenAIBackend())
+    assert embeddings.get_embeddings([], model="text-embedding-3-large").shape == (0, 3072)
+    assert embeddings.get_embeddings([], model="custom-model").shape == (0, 8)
+    assert embeddings.get_embeddings([], model="custom-model").shape == (0, 8)
+    assert calls == [[" "]]
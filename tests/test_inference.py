@@ -0,0 +1,55 @@
+import warnings
+
+import numpy as np
+import pytest
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.inference import MLPInference
+from src.pii_detector import make_mlp
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    # Off-center, unevenly scaled features so the folded scaler matters
+    rng = np.random.default_rng(0)
+    X = (rng.standard_normal((600, 48)) * rng.uniform(0.01, 3, 48) + rng.uniform(-1, 1, 48)).astype(np.float32)
+    y = (X[:, :4].sum(axis=1) > X[:, :4].sum(axis=1).mean()).astype(np.int64)
+    scaler = StandardScaler().fit(X)
+    mlp = make_mlp().set_params(hidden_layer_sizes=(32, 16), max_iter=100)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        mlp.fit(scaler.transform(X), y)
+    return mlp, scaler, rng.standard_normal((500, 48)).astype(np.float32) * 2
+
+
+def test_matches_sklearn(fitted):
+    mlp, scaler, X = fitted
+    engine = MLPInference.from_sklearn(mlp, scaler)
+    expected = mlp.predict_proba(scaler.transform(X))
+
+    p = engine.prob_pii(X)
+    assert p.dtype == np.float32
+    np.testing.assert_allclose(p, expected[:, 1], atol=1e-5)
+    np.testing.assert_allclose(engine.predict_proba(X), expected, atol=1e-5)
+    confident = np.abs(expected[:, 1] - 0.5) > 1e-4
+    np.testing.assert_array_equal(engine.predict(X)[confident], mlp.predict(scaler.transform(X))[confident])
+    assert engine.hidden_layer_sizes == (32, 16)
+    assert engine.n_features == 48
+
+
+def test_without_scaler(fitted):
+    mlp, _, X = fitted
+    engine = MLPInference.from_sklearn(mlp)
+    np.testing.assert_allclose(engine.prob_pii(X), mlp.predict_proba(X)[:, 1], atol=1e-5)
+
+
+def test_rejects_other_activations():
+    X = np.random.default_rng(0).standard_normal((20, 4))
+    mlp = MLPClassifier(hidden_layer_sizes=(3,), activation="tanh", max_iter=5)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        mlp.fit(X, np.arange(20) % 2)
+    with pytest.raises(ValueError, match="relu"):
+        MLPInference.from_sklearn(mlp)
@@ -0,0 +1,37 @@
+import dotenv
+
+from src import embeddings, instrumentation
+
+
+def test_flag_is_read_from_dotenv_on_first_use(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("PIPELINE_METRICS=1\n")
+    # Restore the variable to unset afterwards, whatever .env writes into os.environ
+    monkeypatch.setenv("PIPELINE_METRICS", "")
+    monkeypatch.delenv("PIPELINE_METRICS")
+    real_load = dotenv.load_dotenv
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *args, **kwargs: real_load(env_file))
+    monkeypatch.setattr(embeddings, "_env_loaded", False)
+    monkeypatch.setattr(instrumentation, "_enabled", None)
+
+    assert instrumentation.is_enabled()
+    instrumentation.incr("test.counter", 2)
+    assert instrumentation.snapshot()["counters"]["test.counter"] == 2
+
+
+def test_disabled_without_flag(monkeypatch):
+    monkeypatch.delenv("PIPELINE_METRICS", raising=False)
+    monkeypatch.setattr(instrumentation, "_enabled", None)
+    assert not instrumentation.is_enabled()
+    assert instrumentation.timer("stage") is instrumentation._NULL_TIMER
+    instrumentation.incr("test.counter")
+    assert instrumentation.snapshot()["counters"] == {}
+
+
+def test_enable_overrides_environment(monkeypatch):
+    monkeypatch.delenv("PIPELINE_METRICS", raising=False)
+    monkeypatch.setattr(instrumentation, "_enabled", None)
+    instrumentation.enable()
+    with instrumentation.timer("stage"):
+        pass
+    assert instrumentation.snapshot()["timers"]["stage"]["count"] == 1
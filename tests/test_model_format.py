@@ -0,0 +1,60 @@
+import os
+import pickle
+
+import numpy as np
+
+from src.model_format import default_load_path, file_digest, load_arrays, read_meta, save_arrays
+
+
+def test_round_trip_and_meta(tmp_path):
+    path = tmp_path / "model.bin"
+    arrays = {"W0": np.arange(12, dtype=np.float32).reshape(3, 4), "dims": np.array([5, 1], dtype=np.int32)}
+    save_arrays(path, arrays, meta={"type": "test"})
+    loaded, meta = load_arrays(path)
+    assert meta == read_meta(path) == {"type": "test"}
+    for name, a in arrays.items():
+        np.testing.assert_array_equal(loaded[name], a)
+
+
+def test_save_records_pickle_hash(detector):
+    detector.save()
+    pkl = detector.model_path
+    compact = pkl.with_suffix(".bin")
+    assert read_meta(compact)["source_sha256"] == file_digest(pkl)
+    assert default_load_path(pkl) == compact
+
+    loaded = type(detector)(pkl).load()
+    texts = ["call me at 555-123-4567", "the weather is nice"]
+    np.testing.assert_allclose(
+        [r["prob_pii"] for r in loaded.detect(texts)],
+        [r["prob_pii"] for r in detector.detect(texts)],
+        rtol=1e-5,
+    )
+
+
+def test_compact_copy_follows_pickle_contents_not_mtime(detector):
+    detector.save()
+    pkl = detector.model_path
+    compact = pkl.with_suffix(".bin")
+
+    # Copying or touching the pickle changes its mtime but not its contents
+    stat = compact.stat()
+    os.utime(pkl, (stat.st_atime, stat.st_mtime + 60))
+    assert default_load_path(pkl) == compact
+
+    # A retrained pickle is picked even if the stale .bin looks newer
+    with open(pkl, "wb") as f:
+        pickle.dump({"model": None, "scaler": None, "backend": "retrained"}, f)
+    os.utime(compact, (stat.st_atime, pkl.stat().st_mtime + 60))
+    assert default_load_path(pkl) == pkl
+
+    pkl.unlink()
+    assert default_load_path(pkl) == compact
+
+
+def test_compact_copy_without_hash_is_not_preferred(tmp_path):
+    pkl = tmp_path / "model.pkl"
+    pkl.write_bytes(pickle.dumps({}))
+    save_arrays(pkl.with_suffix(".bin"), {"dims": np.zeros(1, dtype=np.int32)})
+    assert default_load_path(pkl) == pkl
+    assert default_load_path(tmp_path / "missing.pkl") == tmp_path / "missing.pkl"
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.resume_similarity import FOREST_MAX_DIMS, MIN_UPDATE_PAIRS, ResumeSimilarity, select_dims
+
+
+def test_select_dims_threshold_and_cap():
+    importances = np.array([0.1, 0.4, 0.3, 0.2])
+    assert select_dims(importances, threshold=0.7) == [1, 2]
+    assert select_dims(importances, threshold=1.0) == [1, 2, 3, 0]
+    assert select_dims(importances, threshold=1.0, max_dims=2) == [1, 2]
+
+
+@pytest.fixture(scope="module")
+def categories():
+    # Three fields whose resumes differ in a few dimensions; the rest is noise
+    rng = np.random.default_rng(0)
+    dim = 2 * FOREST_MAX_DIMS
+    centers = np.zeros((3, dim))
+    centers[:, :8] = 3 * rng.standard_normal((3, 8))
+    E = np.concatenate([c + rng.standard_normal((20, dim)) for c in centers])
+    resumes = {f"field{k}": [f"resume {k}-{i}" for i in range(20)] for k in range(3)}
+    return resumes, E
+
+
+def _train(categories, engine):
+    resumes, E = categories
+    similarity = ResumeSimilarity()
+    metrics, _, _ = similarity.train(resumes, embeddings=E, engine=engine, n_jobs=1)
+    return similarity, metrics
+
+
+def test_forest_selection_is_capped(categories):
+    similarity, metrics = _train(categories, "forest")
+    assert len(similarity.important_dims) <= FOREST_MAX_DIMS
+    assert 0 <= metrics["dims_stability"] <= 1
+    assert 0 < metrics["importance_covered"] <= 1
+
+
+def test_boosting_reports_no_stability(categories):
+    _, metrics = _train(categories, "gradient_boosting")
+    assert metrics["dims_stability"] is None
+
+
+def test_update_rejects_small_or_one_sided_batches(categories):
+    similarity, _ = _train(categories, "forest")
+    _, E = categories
+    n_trees = len(similarity.model.estimators_)
+    rng = np.random.default_rng(1)
+
+    pairs = rng.integers(0, len(E), size=(MIN_UPDATE_PAIRS - 1, 2))
+    with pytest.raises(ValueError, match="at least"):
+        similarity.update_embeddings(E, pairs, np.arange(len(pairs)) % 2)
+
+    pairs = rng.integers(0, len(E), size=(MIN_UPDATE_PAIRS, 2))
+    with pytest.raises(ValueError, match="both labels"):
+        similarity.update_embeddings(E, pairs, np.ones(len(pairs), dtype=int))
+    assert len(similarity.model.estimators_) == n_trees
+
+    similarity.update_embeddings(E, pairs, np.arange(len(pairs)) % 2)
+    assert len(similarity.model.estimators_) > n_trees
+    assert len(similarity.important_dims) <= FOREST_MAX_DIMS
+
+
+def test_update_after_compact_load(categories, tmp_path):
+    similarity, _ = _train(categories, "forest")
+    _, E = categories
+    path = tmp_path / "resume_model.pkl"
+    similarity.save(path)
+    n_trees = len(similarity.model.estimators_)
+    pairs = np.random.default_rng(1).integers(0, len(E), size=(MIN_UPDATE_PAIRS, 2))
+    labels = np.arange(len(pairs)) % 2
+
+    loaded = ResumeSimilarity(path).load()
+    assert loaded.model is None  # the compact copy was picked
+    loaded.update_embeddings(E, pairs, labels)
+    assert len(loaded.model.estimators_) > n_trees
+
+    path.unlink()
+    loaded = ResumeSimilarity(path).load()
+    with pytest.raises(ValueError, match="compact .bin"):
+        loaded.update_embeddings(E, pairs, labels)
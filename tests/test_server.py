@@ -0,0 +1,94 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.server import MicroBatcher, make_server
+
+
+@pytest.fixture
+def server(detector):
+    batcher = MicroBatcher(detector, max_batch_size=64, max_wait_ms=20)
+    server = make_server(batcher, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    batcher.close()
+
+
+def request(server, method: str, path: str, body: bytes = None) -> tuple[int, dict]:
+    conn = http.client.HTTPConnection(*server.server_address, timeout=30)
+    try:
+        conn.request(method, path, body=body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def test_detect_returns_one_result_per_text(server):
+    status, payload = request(server, "POST", "/detect", json.dumps({"texts": ["a", "b", "c"]}).encode())
+    assert status == 200
+    assert [r["text"] for r in payload["results"]] == ["a", "b", "c"]
+
+    status, payload = request(server, "POST", "/detect", json.dumps({"text": "single"}).encode())
+    assert status == 200 and len(payload["results"]) == 1
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[1, 2]",
+    b'"text"',
+    b'{"texts": "not a list"}',
+    b'{"texts": [1, 2]}',
+    b'{"other": 1}',
+])
+def test_invalid_requests_get_400(server, body):
+    status, payload = request(server, "POST", "/detect", body)
+    assert status == 400
+    assert payload["error"].startswith("invalid request")
+
+
+def test_unknown_path_gets_404(server):
+    assert request(server, "GET", "/nope")[0] == 404
+    assert request(server, "POST", "/nope", b"{}")[0] == 404
+
+
+def test_concurrent_clients_are_batched(server):
+    clients, per_client = 50, 8
+
+    def client(i):
+        statuses = []
+        for j in range(per_client):
+            body = json.dumps({"texts": [f"client {i} request {j}"]}).encode()
+            status, payload = request(server, "POST", "/detect", body)
+            assert payload["results"][0]["text"] == f"client {i} request {j}"
+            statuses.append(status)
+        return statuses
+
+    with ThreadPoolExecutor(clients) as pool:
+        statuses = [s for result in pool.map(client, range(clients)) for s in result]
+
+    assert statuses == [200] * clients * per_client
+    status, metrics = request(server, "GET", "/metrics")
+    assert metrics["requests"] == clients * per_client
+    assert metrics["errors"] == 0
+    assert metrics["batches"] < metrics["requests"]
+    assert metrics["mean_batch_size"] > 1
+
+
+def test_listen_backlog_defaults_to_somaxconn(server, detector):
+    import socket
+
+    assert server.request_queue_size == socket.SOMAXCONN
+    batcher = MicroBatcher(detector)
+    custom = make_server(batcher, "127.0.0.1", 0, backlog=256)
+    try:
+        assert custom.request_queue_size == 256
+    finally:
+        custom.server_close()
+        batcher.close()
@@ -4,15 +4,37 @@ Train PII Detection Model
 
 Usage:
     python train_pii.py
+    python train_pii.py --fast       # skip cross-validation
+    python train_pii.py --prefilter  # also train the regex + linear pre-filter cascade
+    python train_pii.py --stream corpus.jsonl --checkpoint models/pii_stream.ckpt
 """
+import argparse
 import sys
 sys.path.insert(0, ".")
 
 from data.pii_data import get_training_data, get_stats
+from src.embeddings import backend_id
 from src.pii_detector import PIIDetector, print_report
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the PII detection model")
+    parser.add_argument("--fast", action="store_true", help="Skip cross-validation")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds (default: 5)")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel worker processes (default: all cores)")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="Train the cheap pre-filter that short-circuits confident texts before embedding")
+    parser.add_argument("--stream", metavar="JSONL",
+                        help="Train out of core on {\"text\", \"label\"} lines instead of the bundled data")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the --stream file")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Samples per --stream training step")
+    parser.add_argument("--checkpoint", help="Checkpoint file for --stream; resumes if it exists")
+    args = parser.parse_args()
+
+    if args.stream:
+        stream_main(args)
+        return
+
     print("=" * 60)
     print("PII DETECTOR TRAINING")
     print("=" * 60)
@@ -25,12 +47,15 @@ def main():
     print(f"  No PII samples: {stats['no_pii_samples']}")
     print(f"  Balance ratio: {stats['balance_ratio']:.2f}")
 
+    print(f"\nEmbedding backend: {backend_id()}")
+
     # Load data
     texts, labels = get_training_data()
 
     # Train
     detector = PIIDetector()
-    metrics, y_test, y_pred = detector.train(texts, labels)
+    metrics, y_test, y_pred = detector.train(texts, labels, cv=0 if args.fast else args.cv, n_jobs=args.jobs,
+                                              prefilter=args.prefilter)
 
     # Results
     print("\n" + "=" * 60)
@@ -38,10 +63,24 @@ def main():
     print("=" * 60)
     print(f"\nTraining Accuracy: {metrics['train_accuracy']:.2%}")
     print(f"Test Accuracy: {metrics['test_accuracy']:.2%}")
-    print(f"CV Mean: {metrics['cv_mean']:.2%} (+/- {metrics['cv_std'] * 2:.2%})")
+    if metrics["cv_mean"] is not None:
+        print(f"CV Mean: {metrics['cv_mean']:.2%} (+/- {metrics['cv_std'] * 2:.2%})")
     print(f"Iterations: {metrics['iterations']}")
     print(f"Final Loss: {metrics['loss']:.6f}")
 
+    cascade = metrics["cascade"]
+    if cascade:
+        print("\nPre-filter cascade (test split):")
+        for stage, fraction in cascade["traffic"].items():
+            print(f"  {stage}: {fraction:.1%} of texts")
+        print(f"  Linear band: ({cascade['band'][0]:.3f}, {cascade['band'][1]:.3f})")
+        print(f"  Accuracy: {cascade['cascade_accuracy']:.2%} vs {cascade['full_accuracy']:.2%} full path "
+              f"({cascade['accuracy_delta']:+.2%})")
+
+    print("\nWall time per phase:")
+    for phase, seconds in metrics["timings"].items():
+        print(f"  {phase.removesuffix('_sec')}: {seconds:.1f}s")
+
     print_report(y_test, y_pred)
 
     # Save
@@ -52,5 +91,27 @@ def main():
     print("=" * 60)
 
 
+def stream_main(args):
+    """Out-of-core training from a JSONL file."""
+    print("=" * 60)
+    print("PII DETECTOR STREAMING TRAINING")
+    print("=" * 60)
+    print(f"\nData: {args.stream}")
+    print(f"Embedding backend: {backend_id()}")
+
+    detector = PIIDetector()
+    metrics = detector.train_stream(
+        args.stream, chunk_size=args.chunk_size, epochs=args.epochs, checkpoint=args.checkpoint
+    )
+
+    print(f"\nSamples: {metrics['samples']} in {metrics['chunks']} chunks ({metrics['epochs']} epochs)")
+    if metrics["progressive_accuracy"] is not None:
+        print(f"Progressive Accuracy: {metrics['progressive_accuracy']:.2%}")
+    print(f"Final Loss: {metrics['loss']:.6f}")
+    print(f"Throughput: {metrics['samples_per_sec']:.0f} samples/sec")
+
+    detector.save()
+
+
 if __name__ == "__main__":
     main()
@@ -4,16 +4,25 @@ Train Resume Similarity Model
 
 Usage:
     python train_resume.py
+    python train_resume.py --engine forest --jobs 8
 """
+import argparse
 import sys
 sys.path.insert(0, ".")
 
 from sklearn.metrics import classification_report
 from data.resume_data import get_all_resumes, get_stats
-from src.resume_similarity import ResumeSimilarity
+from src.embeddings import backend_id
+from src.resume_similarity import ResumeSimilarity, ENGINES
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the resume similarity model")
+    parser.add_argument("--engine", choices=ENGINES, default="gradient_boosting",
+                        help="Dimension-importance engine (default: gradient_boosting)")
+    parser.add_argument("--jobs", type=int, default=-1, help="Worker threads for the forest engine")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("RESUME SIMILARITY TRAINING")
     print("=" * 60)
@@ -26,21 +35,28 @@ def main():
     for cat, count in stats["resumes_per_category"].items():
         print(f"    {cat}: {count}")
 
+    print(f"\nEmbedding backend: {backend_id()}")
+
     # Load data
     categories = get_all_resumes()
 
     # Train
     similarity = ResumeSimilarity()
-    metrics, y_test, y_pred = similarity.train(categories)
+    metrics, y_test, y_pred = similarity.train(categories, engine=args.engine, n_jobs=args.jobs)
 
     # Results
     print("\n" + "=" * 60)
     print("TRAINING RESULTS")
     print("=" * 60)
     print(f"\nAccuracy: {metrics['accuracy']:.2%}")
+    print(f"Engine: {metrics['engine']} ({metrics['n_estimators']} trees)")
+    print(f"Training time: {metrics['train_time_sec']:.1f}s")
+    if metrics["dims_stability"] is not None:
+        print(f"Dimension stability (Jaccard, tree halves): {metrics['dims_stability']:.2f}")
     print(f"Total dimensions: {metrics['total_dimensions']}")
     print(f"Important dimensions: {metrics['important_dimensions']}")
     print(f"Dimension reduction: {metrics['dimension_reduction']}")
+    print(f"Importance covered: {metrics['importance_covered']:.0%}")
 
     print("\nTop 10 Important Dimensions:")
     for dim, importance in metrics["top_dimensions"]: